@@ -1,6 +1,10 @@
 
 MAX_FILE_CHAR_LENGTH = 10000
 
+# Combined original+new size (in characters) above which write_file skips the
+# per-line attribution diff and writes the content with a single bulk header
+MAX_DIFF_BYTES = 2_000_000
+
 model_name = "gemini-2.0-flash-001"
 
 system_prompt = """
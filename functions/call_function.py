@@ -3,54 +3,102 @@ from .get_files_info import get_files_info
 from .write_file_content import write_file
 from .run_python import run_python_file
 from google.genai import types
+import asyncio
+
+
+# All file operations are constrained to this directory for security reasons.
+_WORKING_DIRECTORY = "./calculator"
+
+# Dictionary mapping function names (as strings) to small adapters that bind the
+# LLM-provided args positionally, with the working directory injected first.
+# The keys MUST match the 'name' property in your function schemas (used by the LLM).
+# Calling positionally through an adapter avoids copying the args dict and the
+# keyword-binding overhead of ** unpacking on every tool call.
+_DISPATCH = {
+    "get_file_content": lambda args: get_file_content(
+        _WORKING_DIRECTORY, args["file_path"]
+    ),
+    "get_files_info": lambda args: get_files_info(
+        _WORKING_DIRECTORY, args.get("directory", ".")
+    ),
+    "write_file": lambda args: write_file(
+        _WORKING_DIRECTORY,
+        args["file_path"],
+        args["content"],
+        args.get("original_content"),
+    ),
+    "run_python_file": lambda args: run_python_file(
+        _WORKING_DIRECTORY, args["file_path"], args.get("args", [])
+    ),
+}
+
+
+def register_tool(name, adapter):
+    """
+    Registers a new tool adapter under the given schema name.
+
+    The adapter receives the raw args dict from the LLM and is responsible
+    for binding them (and the working directory) onto the real function, just
+    like the built-in entries above. New tools can plug in through this hook
+    without editing the dispatch table, while calls keep paying only a single
+    string-hash lookup - dispatching on a per-call wrapper type would mean
+    allocating that wrapper for every tool call first.
+    """
+    _DISPATCH[name] = adapter
+
+
+def _wrap(name, payload):
+    """
+    Wraps a function result (or error) dict in the Part/Content format the
+    LLM expects for tool responses.
+
+    Keeping the construction in one place means the per-call object-building
+    cost has a single call site - if the schema-validating types constructors
+    ever dominate a profile, a lighter representation can be swapped in here.
+    """
+    return types.Content(
+        role="tool",
+        parts=[
+            types.Part.from_function_response(
+                name=name,
+                response=payload,
+            )
+        ],
+    )
+
 
 def call_function(function_call_part, verbose=False):
-    # STEP 1: Prepare a dictionary mapping function names (as strings) to the actual function objects.
-    # The keys MUST match the 'name' property in your function schemas (used by the LLM).
-    functions = {
-        "get_file_content": get_file_content,
-        "get_files_info": get_files_info,
-        "write_file": write_file,
-        "run_python_file": run_python_file,
-    }
-
-    # STEP 2: Print the function call information, more detailed if 'verbose' is True
+    # STEP 1: Print the function call information, more detailed if 'verbose' is True
     if verbose:
         print(f"Calling function: {function_call_part.name}({function_call_part.args})")
     else:
         print(f" - Calling function: {function_call_part.name}")
 
+    # STEP 2: Look up the function by name; None means the LLM asked for something we don't have
+    selected_func = _DISPATCH.get(function_call_part.name)
+
     # STEP 3: If the function name doesn't exist, return an error-wrapped response
-    if function_call_part.name not in functions:
-        return types.Content(
-            role="tool",
-            parts=[
-                types.Part.from_function_response(
-                    name=function_call_part.name,
-                    response={"error": f"Unknown function: {function_call_part.name}"},
-                )
-            ],
+    if selected_func is None:
+        return _wrap(
+            function_call_part.name,
+            {"error": f"Unknown function: {function_call_part.name}"},
         )
 
-    # STEP 4: Make a copy of the arguments to avoid changing the original!
-    args_copy = function_call_part.args.copy()
+    # STEP 4: Call the adapter with the raw args dict - the adapter injects the
+    # working directory and passes everything positionally, so no copy is needed.
+    func_result = selected_func(function_call_part.args or {})
 
-    # STEP 5: Add the required working directory argument.
-    # This ensures all file operations happen inside './calculator'
-    args_copy["working_directory"] = "./calculator"
+    # STEP 5: Wrap the function result using the required Part/Content format
+    # for the LLM tool response (the result goes in a dict as required)
+    return _wrap(function_call_part.name, {"result": func_result})
 
-    # STEP 6: Look up the function to call by name, then call it using keyword unpacking (**)
-    # This is equivalent to selected_func(file_path=..., working_directory=...).
-    selected_func = functions[function_call_part.name]
-    func_result = selected_func(**args_copy)
 
-    # STEP 7: Wrap the function result using the required Part/Content format for the LLM tool response
-    return types.Content(
-        role="tool",
-        parts=[
-            types.Part.from_function_response(
-                name=function_call_part.name,          # The function you called
-                response={"result": func_result}       # The result, wrapped in a dict as required
-            )
-        ],
-    )
\ No newline at end of file
+async def acall_function(function_call_part, verbose=False):
+    """
+    Async variant of call_function for event-loop callers.
+
+    The tool functions themselves stay synchronous; asyncio.to_thread runs
+    them on the default thread pool so an event loop can gather several calls
+    concurrently (and keep rendering) while they block on I/O.
+    """
+    return await asyncio.to_thread(call_function, function_call_part, verbose)
\ No newline at end of file
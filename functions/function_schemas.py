@@ -82,6 +82,10 @@ schema_write_file = types.FunctionDeclaration(
                 type=types.Type.STRING,
                 description="The content to write to the file.",
             ),
+            "original_content": types.Schema(
+                type=types.Type.STRING,
+                description="Optional: the file's current content if already known (e.g. from a previous get_file_content call), so it is not re-read from disk.",
+            ),
         },
         required=["file_path", "content"],  # Both parameters are required for writing
     ),
@@ -94,4 +98,22 @@ ALL_SCHEMAS = [
     schema_get_files_info,
     schema_run_python_file,
     schema_write_file,
-]
\ No newline at end of file
+]
+
+# Tool wrapper built once at import time. Callers should pass this directly
+# as the tools list for generate_content so the schema list is validated and
+# wrapped a single time per process instead of on every request.
+TOOLS = [types.Tool(function_declarations=ALL_SCHEMAS)]
+
+
+# Lightweight catalog for two-stage tool routing: a first "routing" request
+# can send just these name + one-line description pairs (a fraction of the
+# tokens of the full declarations) and ask the model which tools it needs,
+# after which the full schemas are looked up here for the real call.
+NAME_CATALOG = [
+    {"name": schema.name, "description": schema.description.split(".")[0]}
+    for schema in ALL_SCHEMAS
+]
+
+# Full declarations keyed by name, for resolving a routing-stage pick
+SCHEMAS_BY_NAME = {schema.name: schema for schema in ALL_SCHEMAS}
@@ -5,8 +5,22 @@ This module provides secure file reading functionality with path validation
 and content length limiting for AI agent file operations.
 """
 
+import codecs
 import os
 from config import MAX_FILE_CHAR_LENGTH
+from functions.path_utils import (
+    is_suspicious_path,
+    is_within_working_dir,
+    resolve_working_dir,
+)
+
+
+# Cache of recently read files keyed by (path, mtime_ns, size). Agent loops
+# often re-read the same file several times within a turn (e.g. right after
+# listing a directory); the key changes whenever the file does, so a hit can
+# never serve stale content. Bounded with FIFO eviction to cap memory use.
+_READ_CACHE = {}
+_READ_CACHE_MAX_ENTRIES = 64
 
 
 def get_file_content(working_directory, file_path):
@@ -24,14 +38,21 @@ def get_file_content(working_directory, file_path):
         str: The file content (truncated to MAX_FILE_CHAR_LENGTH) or an error message
     """
     
+    # Cheap pure-string rejection first: absolute paths and any ".."
+    # component can be refused from the raw string, before any join or
+    # normalization work
+    if is_suspicious_path(file_path):
+        return f'Error: Cannot read "{file_path}" as it is outside the permitted working directory'
+
     # Convert paths to absolute paths for security validation
     # This prevents relative path attacks like "../../../etc/passwd"
-    abs_working_dir = os.path.abspath(working_directory)
-    target_full_path = os.path.abspath(os.path.join(working_directory, file_path))
+    # The working directory is resolved once per process and memoized
+    abs_working_dir, abs_prefix = resolve_working_dir(working_directory)
+    target_full_path = os.path.normpath(os.path.join(abs_working_dir, file_path))
 
     # Security check: Ensure the target path is within the working_directory
     # This prevents directory traversal attacks
-    if not target_full_path.startswith(abs_working_dir):
+    if not is_within_working_dir(target_full_path, abs_working_dir, abs_prefix):
         return f'Error: Cannot read "{file_path}" as it is outside the permitted working directory'
 
     # Validate that the target path exists and is actually a file (not a directory)
@@ -40,14 +61,55 @@ def get_file_content(working_directory, file_path):
     
     # Attempt to read the file content with proper error handling
     try:
-        # Use context manager (with statement) for automatic file closure
-        with open(target_full_path, "r") as file:
-            
-            # Read file content with length limitation to prevent memory issues
-            # and avoid overwhelming the AI model with extremely large files
-            file_content_string = file.read(MAX_FILE_CHAR_LENGTH)
-            
-            return file_content_string
+        # Check the cache first: one stat() syscall replaces the whole
+        # open + read + decode sequence on a hit
+        st = os.stat(target_full_path)
+        cache_key = (target_full_path, st.st_mtime_ns, st.st_size)
+        cached_content = _READ_CACHE.get(cache_key)
+        if cached_content is not None:
+            return cached_content
+
+        # Empty files need no open/read at all
+        if st.st_size == 0:
+            return ""
+
+        # Read the capped prefix of the file with a single read() on a raw
+        # file descriptor and decode once, skipping the buffered text-IO
+        # layering (and its incremental decoding) that open().read() pays.
+        # The length cap prevents memory issues and avoids overwhelming the
+        # AI model with extremely large files
+        # The stat above gives the exact size, so request precisely the bytes
+        # needed instead of always asking for the full cap. The cap is in
+        # characters but the read is in bytes, so size the truncated case for
+        # the UTF-8 worst case of 4 bytes per character - a byte-sized cap
+        # would cut multi-byte content well short of the character limit
+        read_size = min(st.st_size, MAX_FILE_CHAR_LENGTH * 4 + 4)
+        fd = os.open(target_full_path, os.O_RDONLY)
+        try:
+            data = os.read(fd, read_size)
+        finally:
+            os.close(fd)
+
+        if read_size < st.st_size:
+            # The byte-level cut can land mid code point; decoding with
+            # final=False holds back a trailing partial sequence instead of
+            # raising or emitting U+FFFD
+            decoded = codecs.getincrementaldecoder("utf-8")().decode(data, False)
+        else:
+            decoded = data.decode("utf-8")
+        file_content_string = decoded[:MAX_FILE_CHAR_LENGTH]
+
+        # Populate the cache, evicting the oldest entry once the cap is hit
+        # (dicts preserve insertion order, so the first key is the oldest).
+        # Concurrent misses can race to evict the same key; pop with a
+        # default tolerates the loser instead of raising KeyError - the
+        # cache may briefly overshoot the cap by a few entries, which is
+        # cheaper than taking a lock on every read
+        if len(_READ_CACHE) >= _READ_CACHE_MAX_ENTRIES:
+            _READ_CACHE.pop(next(iter(_READ_CACHE)), None)
+        _READ_CACHE[cache_key] = file_content_string
+
+        return file_content_string
 
     except Exception as E:
         # Return user-friendly error message for any file reading issues
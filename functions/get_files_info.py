@@ -7,6 +7,25 @@ while providing detailed file and directory information.
 """
 
 import os
+from functions.path_utils import (
+    is_suspicious_path,
+    is_within_working_dir,
+    resolve_working_dir,
+)
+
+
+# Memoized results of the project-directory check: the substring scan over
+# the absolute working directory is deterministic per process, so it only
+# needs to run once per distinct directory instead of on every listing.
+_PROJECT_DIR_CACHE = {}
+
+
+def _in_project_dir(abs_working_dir):
+    cached = _PROJECT_DIR_CACHE.get(abs_working_dir)
+    if cached is None:
+        cached = _PROJECT_DIR_CACHE[abs_working_dir] = "/AI_agent" in abs_working_dir
+    return cached
+
 
 def get_files_info(working_directory, directory="."):
     """
@@ -25,14 +44,21 @@ def get_files_info(working_directory, directory="."):
              or an error message if the operation fails
     """
     try:
+        # Cheap pure-string rejection first: absolute paths and any ".."
+        # component can be refused from the raw string, before any join or
+        # normalization work
+        if directory != "." and is_suspicious_path(directory):
+            return f'Error: Cannot list "{directory}" as it is outside the permitted working directory'
+
         # Convert paths to absolute paths for security validation
         # This prevents relative path attacks like "../../../etc/passwd"
-        abs_working_dir = os.path.abspath(working_directory)
-        target_full_path = os.path.abspath(os.path.join(working_directory, directory))
+        # The working directory is resolved once per process and memoized
+        abs_working_dir, abs_prefix = resolve_working_dir(working_directory)
+        target_full_path = os.path.normpath(os.path.join(abs_working_dir, directory))
 
         # Security check: Ensure the target path is within the working_directory
         # This prevents directory traversal attacks using '..' or absolute paths
-        if not target_full_path.startswith(abs_working_dir):
+        if not is_within_working_dir(target_full_path, abs_working_dir, abs_prefix):
             return f'Error: Cannot list "{directory}" as it is outside the permitted working directory'
 
         # Validate that the target path exists and is actually a directory
@@ -41,28 +67,33 @@ def get_files_info(working_directory, directory="."):
             return f'Error: "{directory}" is not a directory'
     
         # Additional security check: Ensure we're working within the AI_agent project
-        # This provides an extra layer of protection for the specific project structure
-        if abs_working_dir.__contains__("/AI_agent") and target_full_path.startswith(abs_working_dir):
-            
-            # Get all items in the target directory
-            dir_contents = os.listdir(target_full_path)
-            
-            # Build a formatted string representation of directory contents
-            content_representation = ""
+        # This provides an extra layer of protection for the specific project
+        # structure. Containment of target_full_path was already verified above,
+        # so only the memoized project check remains here
+        if _in_project_dir(abs_working_dir):
             
-            # Iterate through each item and gather detailed information
-            for file_name in dir_contents:
-                # Use os.path.join for cross-platform path handling
-                file_path = os.path.join(target_full_path, file_name)
-                
-                # Get file/directory properties
-                file_size = os.path.getsize(file_path)  # Size in bytes
-                file_is_dir = os.path.isdir(file_path)  # True if directory, False if file
-                
-                # Format the information in a consistent, readable way
-                content_representation += f"- {file_name}: file_size={file_size} bytes, is_dir={file_is_dir}\n"
-            
-            return content_representation
+            # Collect one formatted line per entry, then join once at the end.
+            # Appending to a list and joining is O(total bytes), unlike
+            # repeated string += which re-allocates the whole string each time
+            lines = []
+
+            # os.scandir yields DirEntry objects whose stat() result is cached
+            # and whose is_dir() can use the directory-entry type directly, so
+            # each entry costs ~1 syscall instead of the ~3 that a listdir +
+            # getsize + isdir combination pays
+            with os.scandir(target_full_path) as dir_entries:
+                for entry in dir_entries:
+                    # Format the information in a consistent, readable way.
+                    # Plain concatenation of known-str pieces skips the
+                    # __format__ dispatch an f-string performs per field,
+                    # which adds up on large directories
+                    lines.append(
+                        "- " + entry.name
+                        + ": file_size=" + str(entry.stat().st_size)
+                        + " bytes, is_dir=" + ("True" if entry.is_dir() else "False")
+                    )
+
+            return "\n".join(lines) + ("\n" if lines else "")
         
         # If we reach here, the security check failed
         return f'Error: Access denied - not within permitted project directory'
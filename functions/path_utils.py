@@ -0,0 +1,71 @@
+"""
+Path Resolution Helpers Module
+
+This module provides shared helpers for the security-validated path handling
+used by the tool functions. The working directory is constant for the lifetime
+of the agent process, so its absolute form is resolved once and memoized
+instead of being recomputed (an os.getcwd() syscall plus normalization) on
+every tool call.
+"""
+
+import os
+
+
+# Memoized working-directory resolutions: raw argument -> (abs_path, prefix).
+# The cached prefix includes a trailing separator so containment checks can't
+# be fooled by sibling directories that merely share a name prefix
+# (e.g. "/foo" matching "/foobar").
+_WORKING_DIR_CACHE = {}
+
+
+def resolve_working_dir(working_directory):
+    """
+    Resolves a working directory to its absolute form, with memoization.
+
+    Args:
+        working_directory (str): The base directory that constrains file access
+
+    Returns:
+        tuple: (abs_working_dir, abs_prefix) where abs_prefix is the absolute
+               path with a trailing separator, ready for containment checks
+    """
+    cached = _WORKING_DIR_CACHE.get(working_directory)
+    if cached is None:
+        abs_working_dir = os.path.abspath(working_directory)
+        cached = (abs_working_dir, abs_working_dir + os.sep)
+        _WORKING_DIR_CACHE[working_directory] = cached
+    return cached
+
+
+def is_suspicious_path(relative_path):
+    """
+    Pure-string prefilter for obviously escaping paths.
+
+    Absolute paths and paths containing a ".." component can be rejected
+    from the raw string alone, before any joining or normalization work.
+    A False result is not a clearance: callers must still run the
+    containment check on the resolved path.
+
+    Args:
+        relative_path (str): The caller-supplied path, relative to the
+                             working directory
+
+    Returns:
+        bool: True if the path should be rejected outright
+    """
+    return os.path.isabs(relative_path) or ".." in relative_path.split(os.sep)
+
+
+def is_within_working_dir(target_path, abs_working_dir, abs_prefix):
+    """
+    Checks that a resolved path is the working directory itself or inside it.
+
+    Args:
+        target_path (str): The absolute path to validate
+        abs_working_dir (str): The absolute working directory
+        abs_prefix (str): The working directory with a trailing separator
+
+    Returns:
+        bool: True if target_path is safely contained in the working directory
+    """
+    return target_path == abs_working_dir or target_path.startswith(abs_prefix)
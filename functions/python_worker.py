@@ -0,0 +1,173 @@
+"""
+Persistent Python Worker Module
+
+This module is the child side of the warm-interpreter optimization used by
+run_python_file. Forking and exec-ing a fresh CPython for every executed
+script costs tens of milliseconds of interpreter startup alone; instead, one
+long-lived worker process is spawned per working directory and fed
+(path, args) requests as JSON lines over stdin, answering with a JSON line
+containing the captured stdout/stderr and an exit code.
+
+Isolation between runs is best-effort: sys.argv is restored, modules imported
+by a script are unloaded afterwards, and each run gets fresh output buffers.
+Scripts that mutate other global interpreter state can still leak it into the
+next run, which is an accepted trade-off for skipping process startup.
+"""
+
+import contextlib
+import io
+import json
+import os
+import runpy
+import sys
+import tempfile
+import traceback
+
+
+class _CappedBuffer:
+    """
+    Write-only text buffer that stops storing once a character cap is hit.
+
+    Runaway scripts can emit unbounded output; storing only the first cap
+    characters keeps the worker's memory (and the response fed back to the
+    LLM) bounded while the script keeps running normally.
+    """
+
+    def __init__(self, cap):
+        self._parts = []
+        self._length = 0
+        self._cap = cap
+        self.truncated = False
+
+    def write(self, text):
+        remaining = self._cap - self._length
+        if remaining > 0:
+            if len(text) > remaining:
+                self._parts.append(text[:remaining])
+                self._length = self._cap
+                self.truncated = True
+            else:
+                self._parts.append(text)
+                self._length += len(text)
+        elif text:
+            self.truncated = True
+        return len(text)
+
+    def flush(self):
+        pass
+
+    def getvalue(self):
+        value = "".join(self._parts)
+        if self.truncated:
+            value += "\n...output truncated..."
+        return value
+
+
+def _run_request(path, args, max_chars):
+    """
+    Executes one script inside this interpreter and captures its output.
+
+    Args:
+        path (str): Absolute path to the Python file to execute
+        args (list): Command line arguments for the script
+        max_chars (int): Per-stream cap on captured output characters
+
+    Returns:
+        dict: {"stdout": str, "stderr": str, "returncode": int}
+    """
+    out_buffer = _CappedBuffer(max_chars)
+    err_buffer = _CappedBuffer(max_chars)
+    returncode = 0
+
+    saved_argv = sys.argv
+    saved_stdin = sys.stdin
+    saved_path = list(sys.path)
+    modules_before = set(sys.modules)
+
+    # redirect_stdout/redirect_stderr only swap the sys-level streams;
+    # subprocesses the script spawns inherit the real fds 1 and 2. Pointing
+    # those at per-run temp files keeps child output captured (as the old
+    # one-process-per-run subprocess.run(capture_output=True) did) without
+    # letting it reach the protocol pipe or the agent's terminal.
+    with tempfile.TemporaryFile() as fd_out, tempfile.TemporaryFile() as fd_err:
+        saved_fd_out = os.dup(1)
+        saved_fd_err = os.dup(2)
+        os.dup2(fd_out.fileno(), 1)
+        os.dup2(fd_err.fileno(), 2)
+        try:
+            sys.argv = [path, *args]
+            # Scripts must not read the protocol stream on stdin
+            sys.stdin = io.StringIO()
+            # Match `python3 script.py` semantics: the script's directory leads
+            # sys.path so its sibling packages are importable
+            sys.path.insert(0, os.path.dirname(path))
+            with contextlib.redirect_stdout(out_buffer), contextlib.redirect_stderr(err_buffer):
+                runpy.run_path(path, run_name="__main__")
+        except SystemExit as exc:
+            # sys.exit() is normal script termination, not a worker error
+            if isinstance(exc.code, int):
+                returncode = exc.code
+            elif exc.code is not None:
+                # sys.exit("message") prints the message and exits with code 1
+                err_buffer.write(f"{exc.code}\n")
+                returncode = 1
+        except BaseException:
+            traceback.print_exc(file=err_buffer)
+            returncode = 1
+        finally:
+            os.dup2(saved_fd_out, 1)
+            os.dup2(saved_fd_err, 2)
+            os.close(saved_fd_out)
+            os.close(saved_fd_err)
+            sys.argv = saved_argv
+            sys.stdin = saved_stdin
+            sys.path[:] = saved_path
+            # Unload modules the script imported so runs stay independent
+            for module_name in set(sys.modules) - modules_before:
+                del sys.modules[module_name]
+
+        # Fold fd-level output into the same capped buffers as the
+        # sys-level streams. Interleaving between the two layers is not
+        # preserved, but nothing a child process wrote is lost
+        for fd_file, buffer in ((fd_out, out_buffer), (fd_err, err_buffer)):
+            fd_file.seek(0)
+            data = fd_file.read()
+            if data:
+                buffer.write(data.decode("utf-8", errors="replace"))
+
+    return {
+        "stdout": out_buffer.getvalue(),
+        "stderr": err_buffer.getvalue(),
+        "returncode": returncode,
+    }
+
+
+def _worker_main():
+    """
+    Request loop: one JSON request per stdin line, one JSON response per
+    stdout line. Exits when the parent closes the pipe.
+    """
+    # Claim the response pipe as a private fd and point fd 1 at /dev/null.
+    # redirect_stdout only swaps sys.stdout; a script that spawns a
+    # subprocess inherits the real fd 1, which would otherwise write
+    # straight into the JSON protocol stream and corrupt it.
+    protocol = os.fdopen(os.dup(sys.stdout.fileno()), "w")
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, sys.stdout.fileno())
+    os.close(devnull)
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        request = json.loads(line)
+        response = _run_request(
+            request["path"],
+            request.get("args", []),
+            request.get("max_chars", 100_000),
+        )
+        protocol.write(json.dumps(response) + "\n")
+        protocol.flush()
+
+
+if __name__ == "__main__":
+    _worker_main()
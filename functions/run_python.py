@@ -3,89 +3,187 @@ Python File Execution Module
 
 This module provides secure Python file execution functionality with path validation,
 timeout protection, and comprehensive output capture for AI agent code execution tasks.
+
+To amortize interpreter startup (fork + exec + CPython init is ~30-80 ms per
+run), scripts are executed by a long-lived worker process (see
+functions/python_worker.py) that is spawned once per working directory and fed
+requests over a pipe. A hung script still honours the 30 second timeout: the
+worker is killed and respawned on the next call.
 """
 
+import atexit
+import json
 import os
+import select
+import shutil
 import subprocess
+import sys
+import threading
+
+
+from config import MAX_FILE_CHAR_LENGTH
+from functions.path_utils import (
+    is_suspicious_path,
+    is_within_working_dir,
+    resolve_working_dir,
+)
+
+
+# Maximum seconds a script may run before its worker is killed
+_EXECUTION_TIMEOUT = 30
+
+# Interpreter used for worker processes, resolved once at import time.
+# Preferring sys.executable keeps the worker on the same interpreter (and
+# virtualenv) as the agent, and the absolute path avoids a PATH search on
+# every spawn.
+_PYTHON = sys.executable or shutil.which("python3") or "python3"
+
+# Path to the child-side worker script
+_WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "python_worker.py")
+
+# One warm worker process per working directory
+_WORKERS = {}
+
+# One lock per working directory, serializing the request/response exchange
+# on that directory's worker. Tool calls are dispatched concurrently from
+# thread pools; without this, two calls interleave their stdin writes and
+# race readline against a single anonymous response stream, delivering
+# results to the wrong caller. Locks outlive worker respawns.
+_WORKER_LOCKS = {}
+
+
+def _get_worker(abs_working_dir):
+    """
+    Returns a live worker process for the given directory, spawning one if
+    none exists yet or the previous worker has died.
+    """
+    worker = _WORKERS.get(abs_working_dir)
+    if worker is None or worker.poll() is not None:
+        worker = subprocess.Popen(
+            [_PYTHON, "-u", _WORKER_SCRIPT],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            cwd=abs_working_dir,
+        )
+        _WORKERS[abs_working_dir] = worker
+    return worker
+
+
+def _discard_worker(abs_working_dir):
+    """
+    Kills and forgets the worker for a directory (used after a timeout or a
+    protocol error so the next call starts from a clean interpreter).
+    """
+    worker = _WORKERS.pop(abs_working_dir, None)
+    if worker is not None and worker.poll() is None:
+        worker.kill()
+        worker.wait()
+
+
+@atexit.register
+def _shutdown_workers():
+    for abs_working_dir in list(_WORKERS):
+        _discard_worker(abs_working_dir)
 
 
 def run_python_file(working_directory, file_path, args=[]):
     """
     Safely executes a Python file within the specified working directory.
-    
+
     This function implements multiple security measures including path validation,
     file type verification, and execution timeout to prevent malicious code execution
     while capturing both stdout and stderr for comprehensive feedback.
-    
+
     Args:
         working_directory (str): The base directory that constrains file access
         file_path (str): The relative path to the Python file within working_directory
         args (list, optional): Command line arguments to pass to the Python script.
                               Defaults to empty list.
-        
+
     Returns:
         str: The combined stdout/stderr output from the executed script,
              or an error message if execution fails
     """
-    
+
+    # Cheap pure-string rejection first: absolute paths and any ".."
+    # component can be refused from the raw string, before any join or
+    # normalization work
+    if is_suspicious_path(file_path):
+        return f'Error: Cannot execute "{file_path}" as it is outside the permitted working directory'
+
     # Convert paths to absolute paths for security validation
     # This prevents relative path attacks like "../../../malicious.py"
-    abs_working_dir = os.path.abspath(working_directory)
-    file_full_path = os.path.abspath(os.path.join(working_directory, file_path))
+    # The working directory is resolved once per process and memoized
+    abs_working_dir, abs_prefix = resolve_working_dir(working_directory)
+    file_full_path = os.path.normpath(os.path.join(abs_working_dir, file_path))
 
     # Security check: Ensure the target file is within the working_directory
     # This prevents directory traversal attacks
-    if not file_full_path.startswith(abs_working_dir):
+    if not is_within_working_dir(file_full_path, abs_working_dir, abs_prefix):
         return f'Error: Cannot execute "{file_path}" as it is outside the permitted working directory'
-    
+
     # Validate that the target file exists
     if not os.path.exists(file_full_path):
         return f'Error: File "{file_path}" not found.'
-    
+
     # Security check: Ensure the target file is actually a Python file
     # This prevents execution of arbitrary file types
     if not file_full_path.endswith(".py"):
         return f'Error: "{file_path}" is not a Python file.'
-    
+
     try:
-        # Build the complete command with python3 interpreter and arguments
-        complete_args = ["python3", file_full_path] + args
-        
-        # Execute the Python file with security constraints:
-        # - timeout=30: Prevents infinite loops or long-running processes
-        # - capture_output=True: Captures both stdout and stderr
-        # - text=True: Returns output as strings instead of bytes
-        # - cwd=abs_working_dir: Sets the working directory for execution
-        completed_process = subprocess.run(
-            complete_args, 
-            timeout=30, 
-            capture_output=True, 
-            text=True, 
-            cwd=abs_working_dir
-        )
+        # setdefault is a single dict operation under the GIL, so concurrent
+        # first callers at worst build one throwaway Lock
+        lock = _WORKER_LOCKS.setdefault(abs_working_dir, threading.Lock())
+        with lock:
+            # Send the request to the warm worker for this directory
+            worker = _get_worker(abs_working_dir)
+            # max_chars bounds what the worker stores per stream, so a runaway
+            # script can't balloon memory or flood the LLM context with output
+            # (same cap as file reads)
+            request = json.dumps(
+                {"path": file_full_path, "args": args, "max_chars": MAX_FILE_CHAR_LENGTH}
+            )
+            worker.stdin.write(request + "\n")
+            worker.stdin.flush()
+
+            # Wait for the one-line JSON response, enforcing the timeout. select
+            # waits for the first byte; once the worker has started answering,
+            # readline finishes the (possibly multi-chunk) line.
+            readable, _, _ = select.select([worker.stdout], [], [], _EXECUTION_TIMEOUT)
+            if not readable:
+                # Hung or looping script: kill the worker so the next call gets
+                # a fresh interpreter
+                _discard_worker(abs_working_dir)
+                return f"Error: Python file execution timed out after {_EXECUTION_TIMEOUT} seconds"
+
+            response_line = worker.stdout.readline()
+            if not response_line:
+                # Worker died mid-request (e.g. the script crashed the process)
+                _discard_worker(abs_working_dir)
+                return "Error executing Python file: worker process exited unexpectedly"
 
-        # Collect and format output from the executed process
+        result = json.loads(response_line)
+
+        # Collect and format output from the executed script
         output = []
-        
+
         # Capture standard output if present
-        if completed_process.stdout:
-            output.append(f"STDOUT:\n{completed_process.stdout}")
-            
+        if result["stdout"]:
+            output.append(f"STDOUT:\n{result['stdout']}")
+
         # Capture error output if present
-        if completed_process.stderr:
-            output.append(f"STDERR:\n{completed_process.stderr}")
+        if result["stderr"]:
+            output.append(f"STDERR:\n{result['stderr']}")
 
         # Report non-zero exit codes (indicating errors or failures)
-        if completed_process.returncode != 0:
-            output.append(f"Process exited with code {completed_process.returncode}")
+        if result["returncode"] != 0:
+            output.append(f"Process exited with code {result['returncode']}")
 
         # Return combined output or indicate no output was produced
         return "\n".join(output) if output else "No output produced."
-                 
-    except subprocess.TimeoutExpired:
-        # Handle timeout specifically for better error messaging
-        return f"Error: Python file execution timed out after 30 seconds"
-        
+
     except Exception as e:
         # Handle any other unexpected errors during execution
         return f"Error executing Python file: {e}"
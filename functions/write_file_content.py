@@ -7,78 +7,133 @@ file manipulation tasks with line-by-line change tracking.
 """
 
 import os
+import stat
 import datetime
 import difflib
 
+from config import MAX_DIFF_BYTES
+from functions.path_utils import (
+    is_suspicious_path,
+    is_within_working_dir,
+    resolve_working_dir,
+)
 
-def write_file(working_directory, file_path, content):
+
+# Comment syntax by (lowercased) file extension, resolved with one dict
+# lookup instead of a chain of endswith tests per write. Tuple values are
+# (start, end) pairs for languages with block-style comments.
+_COMMENT_STYLES = {
+    ".py": "# ",
+    ".js": "// ",
+    ".ts": "// ",
+    ".java": "// ",
+    ".c": "// ",
+    ".cpp": "// ",
+    ".cs": "// ",
+    ".html": ("<!-- ", " -->"),
+    ".xml": ("<!-- ", " -->"),
+    ".md": ("<!-- ", " -->"),
+    ".css": ("/* ", " */"),
+    ".scss": ("/* ", " */"),
+}
+_DEFAULT_COMMENT_STYLE = "# "
+
+# Above this many lines the O(N*M) worst case of a real diff gets too
+# expensive; attribution falls back to a cheap set-membership pass instead
+_DIFF_LINE_LIMIT = 50_000
+
+
+def write_file(working_directory, file_path, content, original_content=None, durable=False):
     """
     Safely writes content to a file with line-by-line AI attribution for changes.
-    
+
     This function compares the new content with existing file content (if any),
     identifies changed lines, and adds inline comments to mark AI modifications.
-    
+
     Args:
         working_directory (str): The base directory that constrains file access
         file_path (str): The relative path to the file within working_directory
         content (str): The content to write to the file
-        
+        original_content (str, optional): The file's current content, if the
+                                  caller already has it (e.g. from an earlier
+                                  get_file_content in the same conversation).
+                                  Skips re-reading the file from disk.
+        durable (bool, optional): If True, fsync the file before closing so the
+                                  data survives a crash. Defaults to False - these
+                                  are regenerable agent artifacts, and fsync costs
+                                  milliseconds per write.
+
     Returns:
         str: Success message with character count and change summary
     """
     
+    # Cheap pure-string rejection first: absolute paths and any ".."
+    # component can be refused from the raw string, before any join or
+    # normalization work
+    if is_suspicious_path(file_path):
+        return f'Error: Cannot write to "{file_path}" as it is outside the permitted working directory'
+
     # Convert paths to absolute paths for security validation
-    abs_working_dir = os.path.abspath(working_directory)
-    file_full_path = os.path.abspath(os.path.join(working_directory, file_path))
+    # The working directory is resolved once per process and memoized
+    abs_working_dir, abs_prefix = resolve_working_dir(working_directory)
+    file_full_path = os.path.normpath(os.path.join(abs_working_dir, file_path))
 
-    # Security check: Ensure the target path is within the working_directory
-    if not file_full_path.startswith(abs_working_dir):
+    # Security check: Ensure the target path is within the working_directory.
+    # The separator-aware check also closes the bare-startswith hole where a
+    # sibling like "/tmp/project-evil" passed for working dir "/tmp/project"
+    if not is_within_working_dir(file_full_path, abs_working_dir, abs_prefix):
         return f'Error: Cannot write to "{file_path}" as it is outside the permitted working directory'
     
-    # Create parent directories if they don't exist
-    if not os.path.exists(file_full_path):
+    # One stat() answers both "does it exist" and "is it a directory";
+    # the previous exists/exists/isdir/exists sequence cost four syscalls
+    # for the same information
+    try:
+        target_stat = os.stat(file_full_path)
+        is_new_file = False
+        if stat.S_ISDIR(target_stat.st_mode):
+            return f'Error: "{file_path}" is a directory, not a file'
+    except FileNotFoundError:
+        is_new_file = True
+        # Create parent directories if they don't exist (exist_ok makes a
+        # separate pre-check redundant)
         try:
             os.makedirs(os.path.dirname(file_full_path), exist_ok=True)
         except Exception as e:
             return f"Error creating directory: {e}"
-    
-    # Validate that the target path is not a directory
-    if os.path.exists(file_full_path) and os.path.isdir(file_full_path):
-        return f'Error: "{file_path}" is a directory, not a file'
-    
+
     # ========== LINE-BY-LINE ATTRIBUTION ==========
     timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    
-    # Read existing content if file exists
-    original_content = ""
-    is_new_file = not os.path.exists(file_full_path)
-    
-    if not is_new_file:
+
+    # Read existing content if the file exists and the caller didn't already
+    # supply it - the agent usually get_file_content'd this file moments ago,
+    # so passing it back saves a read()+decode per edit
+    original_from_disk = False
+    if not is_new_file and original_content is None:
         try:
             with open(file_full_path, 'r') as f:
                 original_content = f.read()
+            original_from_disk = True
         except Exception:
             original_content = ""
-    
-    # Get comment style based on file extension
-    def get_comment_style(file_path):
-        if file_path.endswith('.py'):
-            return "# "
-        elif file_path.endswith(('.js', '.ts', '.java', '.c', '.cpp', '.cs')):
-            return "// "
-        elif file_path.endswith(('.html', '.xml')):
-            return "<!-- ", " -->"
-        elif file_path.endswith('.md'):
-            return "<!-- ", " -->"
-        elif file_path.endswith(('.css', '.scss')):
-            return "/* ", " */"
-        else:
-            return "# "  # Default
-    
-    # Process content with line-by-line attribution
-    def add_line_attribution(original_content, new_content, file_path, timestamp):
-        comment_style = get_comment_style(file_path)
-        
+    elif original_content is None:
+        original_content = ""
+
+    # Short-circuit the common "regenerate identical file" case: nothing to
+    # diff, nothing to rewrite, no write() syscall. Only trusted when this
+    # call read the file itself - caller-supplied original_content may not
+    # match what is actually on disk, and skipping the write on its say-so
+    # would silently leave stale bytes behind
+    if original_from_disk and original_content == content:
+        return (
+            f'No changes to "{file_path}" - content is identical '
+            f"({len(content)} characters)"
+        )
+
+    # Process content with line-by-line attribution. Returns the finished
+    # file as UTF-8 bytes: unchanged blocks are encoded in bulk and the
+    # attribution suffix is encoded exactly once, instead of the whole
+    # assembled string being re-encoded (suffix copies included) at write time
+    def add_line_attribution(original_content, new_content, comment_style, timestamp):
         # Handle HTML-style comments (with start and end)
         if isinstance(comment_style, tuple):
             comment_start, comment_end = comment_style
@@ -87,53 +142,146 @@ def write_file(working_directory, file_path, content):
         else:
             ai_comment = f" {comment_style}Modified by AI Agent on {timestamp}"
             file_header = f"{comment_style}File created by AI Agent on {timestamp}"
-        
-        # Split into lines
-        original_lines = original_content.splitlines() if original_content else []
-        new_lines = new_content.splitlines()
-        
-        # If it's a new file, ALWAYS add attribution header
+
+        # The suffix is appended to every changed line; encode it once here
+        # so those lines only pay for encoding their own text
+        ai_comment_bytes = ai_comment.encode("utf-8")
+
+        # If it's a new file, ALWAYS add attribution header - and skip all
+        # the line splitting and diff machinery below. The single f-string
+        # builds the result in one allocation instead of chained +
         if is_new_file:
             if new_content.strip():  # File has content
-                return file_header + "\n" + new_content
+                return f"{file_header}\n{new_content}".encode("utf-8")
             else:  # File is empty - just add the header
-                return file_header + "\n"
-        
-        # For existing files, identify changed lines
-        result_lines = []
-        
-        # Simple line-by-line comparison
-        for i in range(len(new_lines)):
-            line = new_lines[i]
-            
-            # Check if this line is different from original
-            if i >= len(original_lines) or (i < len(original_lines) and line != original_lines[i]):
-                # This line was added or modified
-                if line.strip():  # Don't add comments to empty lines
-                    line_with_comment = line + ai_comment
-                    result_lines.append(line_with_comment)
-                else:
-                    result_lines.append(line)
+                return f"{file_header}\n".encode("utf-8")
+
+        # Above the size ceiling the diff cost dominates the write and nobody
+        # reads per-line markers in a file this large anyway: keep the content
+        # verbatim under a single bulk-modification header
+        if len(original_content) + len(new_content) > MAX_DIFF_BYTES:
+            if isinstance(comment_style, tuple):
+                bulk_header = f"{comment_start}Bulk modified by AI Agent on {timestamp}{comment_end}"
             else:
-                # Line unchanged
-                result_lines.append(line)
-        
-        return "\n".join(result_lines)
+                bulk_header = f"{comment_style}Bulk modified by AI Agent on {timestamp}"
+            return f"{bulk_header}\n{new_content}".encode("utf-8")
+
+        # Split into lines. str.split('\n') is a tighter loop than
+        # splitlines() (which scans for every Unicode terminator), and its
+        # trailing empty element round-trips a final newline exactly through
+        # the '\n'.join below instead of silently stripping it
+        original_lines = original_content.split("\n") if original_content else []
+        new_lines = new_content.split("\n")
+
+        # For existing files, identify changed lines with a real diff.
+        # Agent edits usually touch a handful of lines in a long file, so
+        # first strip the identical leading and trailing lines - a cheap
+        # O(N) pass that slashes the O(N*M) interior the diff has to scan
+        head = 0
+        max_head = min(len(original_lines), len(new_lines))
+        while head < max_head and original_lines[head] == new_lines[head]:
+            head += 1
+
+        tail = 0
+        max_tail = max_head - head
+        while (
+            tail < max_tail
+            and original_lines[len(original_lines) - 1 - tail]
+            == new_lines[len(new_lines) - 1 - tail]
+        ):
+            tail += 1
+
+        # Diff only the differing middle. A positional line-by-line compare
+        # would mark every line after the first insertion as "modified";
+        # SequenceMatcher opcodes attribute only the lines that actually
+        # changed, and its inner comparison runs in C. autojunk=False avoids
+        # the popular-line heuristic, which misfires on code files full of
+        # repeated blank/brace lines
+        original_middle = original_lines[head:len(original_lines) - tail]
+        new_middle = new_lines[head:len(new_lines) - tail]
+
+        # Output is assembled as byte chunks joined with b"\n": multi-line
+        # unchanged blocks encode in one bulk str.encode call, changed lines
+        # encode their text once and reuse the pre-encoded suffix.
+        # The unchanged head passes through verbatim
+        chunks = []
+        if head:
+            chunks.append("\n".join(new_lines[:head]).encode("utf-8"))
+
+        # Very large middles would hit SequenceMatcher's quadratic worst
+        # case; degrade to a set-membership pass that annotates any line not
+        # present in the original. Coarser attribution, but O(N)
+        if max(len(original_middle), len(new_middle)) > _DIFF_LINE_LIMIT:
+            original_set = set(original_middle)
+            for line in new_middle:
+                if line.strip() and line not in original_set:
+                    chunks.append(line.encode("utf-8") + ai_comment_bytes)
+                else:
+                    chunks.append(line.encode("utf-8"))
+            if tail:
+                chunks.append("\n".join(new_lines[len(new_lines) - tail:]).encode("utf-8"))
+            return b"\n".join(chunks)
+
+        # Intern each distinct line to a small int so the matcher compares
+        # and hashes machine words instead of re-hashing line strings in its
+        # inner loop. Identical lines get identical ids, so the opcodes are
+        # the same as they would be over the strings themselves
+        line_ids = {}
+        a_ids = [line_ids.setdefault(line, len(line_ids)) for line in original_middle]
+        b_ids = [line_ids.setdefault(line, len(line_ids)) for line in new_middle]
+        matcher = difflib.SequenceMatcher(a=a_ids, b=b_ids, autojunk=False)
+
+        for tag, _i1, _i2, j1, j2 in matcher.get_opcodes():
+            if tag == "equal":
+                # Unchanged block - encoded as-is in one bulk call
+                chunks.append("\n".join(new_middle[j1:j2]).encode("utf-8"))
+            elif tag in ("insert", "replace"):
+                # Added or modified lines get the attribution comment
+                # (empty lines are left unannotated)
+                for line in new_middle[j1:j2]:
+                    if line.strip():
+                        chunks.append(line.encode("utf-8") + ai_comment_bytes)
+                    else:
+                        chunks.append(line.encode("utf-8"))
+            # "delete" blocks have nothing to emit in the new content
+
+        # Unchanged tail passes through verbatim
+        if tail:
+            chunks.append("\n".join(new_lines[len(new_lines) - tail:]).encode("utf-8"))
+
+        return b"\n".join(chunks)
     
     # Apply line-by-line attribution
-    final_content = add_line_attribution(original_content, content, file_path, timestamp)
-    
-    # Write the content to the file
+    comment_style = _COMMENT_STYLES.get(
+        os.path.splitext(file_path)[1].lower(), _DEFAULT_COMMENT_STYLE
+    )
+    data = add_line_attribution(original_content, content, comment_style, timestamp)
+
+    # Write the pre-assembled bytes to the file. Pushing the whole buffer
+    # through os.write skips the TextIOWrapper/BufferedWriter layers that
+    # buffered open() stacks on every write; for the one-shot writes this
+    # function does, that is a single syscall for the common case.
     try:
-        with open(file_full_path, "w") as file:
-            file.write(final_content)
-            
-            # Count changes for feedback
-            original_line_count = len(original_content.splitlines()) if original_content else 0
-            new_line_count = len(final_content.splitlines())
-            
-            action = "created" if is_new_file else "modified"
-            return f'Successfully {action} "{file_path}" with line-by-line AI attribution ({len(final_content)} characters, {new_line_count} lines, {abs(new_line_count - original_line_count)} lines changed)'
+        fd = os.open(file_full_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            # os.write may do a partial write on huge buffers; the memoryview
+            # slice continues where it left off without copying the data
+            view = memoryview(data)
+            offset = 0
+            while offset < len(data):
+                offset += os.write(fd, view[offset:])
+            if durable:
+                os.fsync(fd)
+        finally:
+            os.close(fd)
+
+        # Count changes for feedback (line counts come straight from the
+        # byte buffer, so the written string never needs re-materializing)
+        original_line_count = len(original_content.splitlines()) if original_content else 0
+        new_line_count = data.count(b"\n") + (0 if data.endswith(b"\n") else 1) if data else 0
+
+        action = "created" if is_new_file else "modified"
+        return f'Successfully {action} "{file_path}" with line-by-line AI attribution ({len(data)} characters, {new_line_count} lines, {abs(new_line_count - original_line_count)} lines changed)'
 
     except PermissionError:
         return f"Error: Permission denied writing to '{file_path}'"
@@ -21,27 +21,63 @@ Example:
     python main.py "how does the calculator render results to the console?" --verbose
 """
 
+import asyncio
 import os
+import re
 import sys
+import httpx
 from dotenv import load_dotenv
 from google import genai
 from google.genai import types
 from rich import print  # Beautiful text formatting, syntax highlighting, tables, progress bars, markdown, etc.
+from rich.panel import Panel
+from rich.console import Console, Group
+from rich.spinner import Spinner
+from rich.live import Live
+from rich.syntax import Syntax
 from prompt_toolkit import prompt  # Builds interactive input prompts (autocomplete, history, validation).
 import config  # Config file with constants/other config variables.
 import functions.function_schemas
-from functions.call_function import call_function
+from functions.call_function import acall_function
+
+
+# One shared console for spinner/live rendering, created once at import time
+# instead of per agent iteration
+_CONSOLE = Console()
+
+# Detects "Python source" function results (attribution header followed by a
+# def or import somewhere) in a single precompiled scan instead of one
+# startswith plus two substring searches per verbose result
+_PY_CODE_RE = re.compile(r"^#.*?(?:def |import )", re.S)
 
 
 # Load environment variables from .env file
 load_dotenv()
 
-# Initialize the Gemini API client with the API key from environment variables
+# Initialize the Gemini API client with the API key from environment variables.
+# The client is a module singleton shared by the CLI loop and the TUI, so its
+# httpx connection pool persists across every iteration and user message -
+# keepalive connections mean only the first request in a session pays the
+# TCP+TLS handshake. client_args/async_client_args are forwarded to the
+# underlying sync and async httpx clients respectively.
+_HTTP_POOL_LIMITS = httpx.Limits(max_connections=50, max_keepalive_connections=20)
+_HTTP_OPTIONS = types.HttpOptions(
+    client_args={"timeout": 60.0, "limits": _HTTP_POOL_LIMITS},
+    async_client_args={"timeout": 60.0, "limits": _HTTP_POOL_LIMITS},
+)
 api_key = os.environ.get("GEMINI_API_KEY")
-client = genai.Client(api_key=api_key)
+client = genai.Client(api_key=api_key, http_options=_HTTP_OPTIONS)
 
+# Generation config built once at module scope: the tool declarations and
+# system prompt never change between iterations, so there is no reason to
+# re-validate and re-encode them on every generate_content call
+_CFG = types.GenerateContentConfig(
+    tools=functions.function_schemas.TOOLS,
+    system_instruction=config.system_prompt,
+)
 
-def main():
+
+async def main():
     """
     Main function that orchestrates the AI agent's operation.
     
@@ -91,10 +127,6 @@ def main():
         types.Content(role="user", parts=[types.Part(text=user_prompt)]),  # role = "user" or "model" (AI/LLM = model)
     ]
 
-    # Define available functions that the AI can call
-    # This tells the AI what tools it has access to
-    available_functions = types.Tool(function_declarations=functions.function_schemas.ALL_SCHEMAS)
-
     # ========== MAIN AGENT LOOP ==========
     # The agent loop allows the AI to make multiple "moves" and build up context
     for iteration in range(20):  # Max 20 iterations to prevent infinite loops
@@ -104,72 +136,86 @@ def main():
             response = client.models.generate_content(
                 model=config.model_name,
                 contents=messages,  # Pass entire conversation history for context
-                config=types.GenerateContentConfig(
-                    tools=[available_functions],  # Provide available functions to the AI
-                    system_instruction=config.system_prompt  # System-level instructions for the AI
-                ),
+                config=_CFG,  # Tools + system prompt, built once at module scope
             )
 
-            # Add AI's response to the conversation history
-            # This ensures the AI remembers what it just "said" or "thought"
-            for candidate in response.candidates:
-                messages.append(candidate.content)
-
             # ========== CHECK IF AGENT IS DONE ==========
             # If AI provides text response and no function calls, it's finished
-            if not response.function_calls:
-                from rich.panel import Panel
-                print(Panel(response.text, title="🎯 Final Answer", style="bold green"))
-                break  # Exit the loop - agent is done!
+            # (the candidates still get appended to history below).
+            # function_calls is a computed proto accessor, so it is read once
+            # per iteration and reused below
+            function_calls = response.function_calls
+            done = not function_calls
 
             # ========== VERBOSE OUTPUT DISPLAY ==========
-            # Show detailed information about the AI's thinking process
-            if verbose_flag:
-                from rich.panel import Panel
-                
+            # Show detailed information about the AI's thinking process.
+            # Renderables are collected and emitted as one Group so the whole
+            # phase costs a single console write instead of one write() per
+            # print call
+            verbose_out = []
+            if verbose_flag and not done:
                 # Create a beautiful iteration header
-                print(Panel(f"🤖 Agent Iteration #{iteration}", style="cyan bold"))
-                print(f"📝 Conversation: {len(messages)} messages")
-                
-                # Show AI thinking with nice formatting
-                # Extract the AI's reasoning text from the response
-                for candidate in response.candidates:
-                    for part in candidate.content.parts:
-                        if hasattr(part, 'text') and part.text and part.text.strip():
+                verbose_out.append(Panel(f"🤖 Agent Iteration #{iteration}", style="cyan bold"))
+                verbose_out.append(f"📝 Conversation: {len(messages)} messages")
+
+            # Add AI's response to the conversation history so the AI
+            # remembers what it just "said" or "thought". The verbose thinking
+            # preview is extracted in the same pass, so the candidate protos
+            # are only walked once per iteration
+            shown_thinking = False
+            for candidate in response.candidates:
+                content = candidate.content
+                messages.append(content)
+                if verbose_flag and not done and not shown_thinking:
+                    for part in content.parts:
+                        text = getattr(part, 'text', None)
+                        if text and text.strip():
                             # Truncate long thoughts for readability
-                            thinking_text = part.text[:200] + "..." if len(part.text) > 200 else part.text
-                            print(Panel(thinking_text, title="💭 AI Thinking", style="yellow"))
+                            thinking_text = text[:200] + "..." if len(text) > 200 else text
+                            verbose_out.append(Panel(thinking_text, title="💭 AI Thinking", style="yellow"))
+                            shown_thinking = True
                             break
-                
+
+            if done:
+                print(Panel(response.text, title="🎯 Final Answer", style="bold green"))
+                break  # Exit the loop - agent is done!
+
+            if verbose_flag:
                 # Show which functions the AI wants to call
-                if response.function_calls:
-                    function_names = [f"🔧 {fc.name}" for fc in response.function_calls]
-                    print(f"[bold green]Calling:[/bold green] {', '.join(function_names)}")
-                print()  # Add some spacing for readability
+                if function_calls:
+                    function_names = [f"🔧 {fc.name}" for fc in function_calls]
+                    verbose_out.append(f"[bold green]Calling:[/bold green] {', '.join(function_names)}")
+                verbose_out.append("")  # Add some spacing for readability
+                print(Group(*verbose_out))
 
             # Handle the AI response - check if it wants to call a function
-            if response.function_calls:
-                # Process each function call the AI wants to make
-                for function_call_part in response.function_calls:
+            if function_calls:
+                # ========== FUNCTION EXECUTION WITH SPINNER ==========
+                # Execute every requested function call; independent calls are
+                # dispatched concurrently so the turn takes about as long as the
+                # slowest call instead of the sum of all of them.
+                if verbose_flag:
+                    call_names = ", ".join(fc.name for fc in function_calls)
 
-                    # ========== FUNCTION EXECUTION WITH SPINNER ==========
-                    # Show spinner while function is executing (if verbose)
-                    if verbose_flag:
-                        from rich.console import Console
-                        from rich.spinner import Spinner
-                        from rich.live import Live
-                        import time
-                        
-                        console = Console()
-                        
-                        # Show animated spinner while function executes
-                        with Live(Spinner("dots", text=f"⚙️  Executing {function_call_part.name}..."), 
-                                console=console, refresh_per_second=10):
-                            function_call_result = call_function(function_call_part, verbose=verbose_flag)
-                            time.sleep(0.2)  # Brief pause to show the spinner
-                    else:
-                        # No spinner for non-verbose mode (clean output)
-                        function_call_result = call_function(function_call_part, verbose=verbose_flag)
+                    # Show animated spinner only for as long as the function
+                    # calls actually run; transient=True cleans it up so fast
+                    # tools don't leave a half-rendered frame behind
+                    with Live(Spinner("dots", text=f"⚙️  Executing {call_names}..."),
+                            console=_CONSOLE, refresh_per_second=10, transient=True):
+                        function_call_results = await asyncio.gather(
+                            *(acall_function(fc, verbose=verbose_flag) for fc in function_calls)
+                        )
+                else:
+                    # No spinner for non-verbose mode (clean output)
+                    function_call_results = await asyncio.gather(
+                        *(acall_function(fc, verbose=verbose_flag) for fc in function_calls)
+                    )
+
+                # Process each function result in the order the calls were
+                # made. Verbose panels for the whole batch are collected and
+                # printed in one write after the loop
+                result_out = []
+                for function_call_result in function_call_results:
 
                     # Extract the function response from the result
                     function_response_part = function_call_result.parts[0].function_response
@@ -181,42 +227,57 @@ def main():
                     # ========== BEAUTIFUL FUNCTION RESULT DISPLAY ==========
                     # Format and display function results with syntax highlighting and panels
                     if verbose_flag:
-                        from rich.panel import Panel
-                        from rich.syntax import Syntax
-                        
                         result = function_response_part.response
-                        if isinstance(result, dict) and 'result' in result:
-                            content = result['result']
-                            
-                            # Syntax highlighting for Python code files
-                            if content.startswith('#') and ('def ' in content or 'import ' in content):
-                                lines = content.split('\n')[:10]  # Show first 10 lines
-                                code_preview = '\n'.join(lines)
+                        # dict.get folds the membership test and the lookup
+                        # into one hash probe; call_function always wraps
+                        # results this way, so None means an error payload
+                        content = result.get('result') if isinstance(result, dict) else None
+                        if content is not None:
+
+                            # Syntax highlighting for Python code files. The
+                            # preview slices the content at the 10th newline
+                            # rather than splitting the whole file into a list,
+                            # and count('\n') replaces a second full split that
+                            # existed only to count lines
+                            if _PY_CODE_RE.match(content):
+                                end = -1
+                                for _ in range(10):  # Show first 10 lines
+                                    end = content.find('\n', end + 1)
+                                    if end == -1:
+                                        break
+                                code_preview = content[:end] if end != -1 else content
                                 syntax = Syntax(code_preview, "python", theme="monokai", line_numbers=True)
-                                print(Panel(syntax, title="📄 Code Preview"))
+                                result_out.append(Panel(syntax, title="📄 Code Preview"))
                                 # Show count of remaining lines if file is longer
-                                if len(content.split('\n')) > 10:
-                                    remaining = len(content.split('\n')) - 10
-                                    print(f"[dim]... and {remaining} more lines[/dim]")
+                                total_lines = content.count('\n') + 1
+                                if total_lines > 10:
+                                    result_out.append(f"[dim]... and {total_lines - 10} more lines[/dim]")
                             
-                            # Nice formatted panel for file/directory listings
-                            elif 'file_size=' in content:
-                                print(Panel(content, title="📁 Directory Contents", style="blue"))
+                            # Nice formatted panel for file/directory listings.
+                            # Listings always start with "- "; bounding the
+                            # substring search to the first 200 chars keeps it
+                            # O(1) instead of scanning a whole file payload
+                            elif content.startswith('- ') and 'file_size=' in content[:200]:
+                                result_out.append(Panel(content, title="📁 Directory Contents", style="blue"))
                             
                             # Regular content in green panel with smart truncation
                             else:
                                 display_content = content[:300] + "..." if len(content) > 300 else content
-                                print(Panel(display_content, title="📄 Function Result", style="green"))
+                                result_out.append(Panel(display_content, title="📄 Function Result", style="green"))
                         else:
                             # Fallback for non-dict results
-                            print(Panel(str(result), title="📄 Function Result", style="green"))
+                            result_out.append(Panel(str(result), title="📄 Function Result", style="green"))
 
                     # ========== ADD FUNCTION RESULT TO CONVERSATION ==========
                     # Convert function result to a message and add to conversation history
                     # This allows the AI to see the results of its function calls in the next iteration
                     tool_message = types.Content(role="tool", parts=function_call_result.parts)
                     messages.append(tool_message)
-                    
+
+                # One console write for the whole batch of result panels
+                if result_out:
+                    print(Group(*result_out))
+
         except Exception as e:
             # ========== ERROR HANDLING ==========
             # Gracefully handle any errors during processing
@@ -240,4 +301,4 @@ if __name__ == "__main__":
             sys.exit(1)
     else:
         # Run original CLI mode
-        main()
\ No newline at end of file
+        asyncio.run(main())
\ No newline at end of file
@@ -1,8 +1,116 @@
 import unittest
+from functools import lru_cache
+from pyfakefs import fake_filesystem_unittest
 from functions.get_files_info import get_files_info
 from functions.get_file_content import get_file_content
 from functions.write_file_content import write_file
 from functions.run_python import run_python_file
+from functions.path_utils import (
+    is_suspicious_path,
+    is_within_working_dir,
+    resolve_working_dir,
+)
+
+
+@lru_cache(maxsize=None)
+def _load_fixture(path):
+    """
+    Reads a real-filesystem fixture file once per process. Every test (and
+    repeated -k runs in the same process) after the first gets the cached
+    bytes instead of paying another open+read.
+    """
+    with open(path, "rb") as f:
+        return f.read()
+
+
+class TestFileOpsOnFakeFs(fake_filesystem_unittest.TestCase):
+    """
+    File-operation tests against an in-memory pyfakefs tree: every open,
+    stat and scandir resolves in RAM, so these run without touching disk
+    and can't interfere with the real calculator/ directory.
+    (run_python_file spawns a real child process, so its tests stay below
+    on the real filesystem.)
+    """
+
+    WORKING_DIR = "/AI_agent/calculator"
+
+    @classmethod
+    def setUpClass(cls):
+        # Real-filesystem fixtures load once per process (setUpClass runs
+        # before pyfakefs patches the filesystem in setUp)
+        cls.main_py = _load_fixture("calculator/main.py")
+        cls.calculator_py = _load_fixture("calculator/pkg/calculator.py")
+
+    def setUp(self):
+        self.setUpPyfakefs()
+        self.fs.create_file(self.WORKING_DIR + "/main.py", contents=self.main_py)
+        self.fs.create_file(
+            self.WORKING_DIR + "/lorem.txt",
+            contents="lorem ipsum dolor sit amet",
+        )
+        self.fs.create_file(
+            self.WORKING_DIR + "/pkg/calculator.py", contents=self.calculator_py
+        )
+
+    def test_list_current_dir(self):
+        result = get_files_info(self.WORKING_DIR, ".")
+        self.assertIn("- main.py: file_size=", result)
+        self.assertIn("- pkg: ", result)
+        self.assertIn("is_dir=True", result)
+
+    def test_list_outside_dir_is_rejected(self):
+        result = get_files_info(self.WORKING_DIR, "../")
+        self.assertTrue(result.startswith("Error:"))
+
+    def test_read_file(self):
+        result = get_file_content(self.WORKING_DIR, "lorem.txt")
+        self.assertEqual(result, "lorem ipsum dolor sit amet")
+
+    def test_read_missing_file(self):
+        result = get_file_content(self.WORKING_DIR, "pkg/does_not_exist.py")
+        self.assertTrue(result.startswith("Error:"))
+
+    def test_write_new_file(self):
+        result = write_file(self.WORKING_DIR, "pkg/morelorem.txt", "lorem ipsum")
+        self.assertIn("Successfully created", result)
+        with open(self.WORKING_DIR + "/pkg/morelorem.txt") as f:
+            self.assertIn("lorem ipsum", f.read())
+
+    def test_write_outside_dir_is_rejected(self):
+        result = write_file(self.WORKING_DIR, "/tmp/temp.txt", "this should not be allowed")
+        self.assertTrue(result.startswith("Error:"))
+
+
+class TestPathUtils(unittest.TestCase):
+
+    def test_working_dir_itself_is_within(self):
+        abs_wd, prefix = resolve_working_dir("calculator")
+        self.assertTrue(is_within_working_dir(abs_wd, abs_wd, prefix))
+
+    def test_child_path_is_within(self):
+        abs_wd, prefix = resolve_working_dir("calculator")
+        self.assertTrue(is_within_working_dir(abs_wd + "/pkg/render.py", abs_wd, prefix))
+
+    def test_sibling_with_shared_name_prefix_is_rejected(self):
+        # "/foo" must not match "/foobar" - the check compares against the
+        # directory plus a trailing separator, not a bare string prefix
+        abs_wd, prefix = resolve_working_dir("calculator")
+        self.assertFalse(is_within_working_dir(abs_wd + "2/evil.py", abs_wd, prefix))
+
+    def test_parent_path_is_rejected(self):
+        abs_wd, prefix = resolve_working_dir("calculator")
+        self.assertFalse(is_within_working_dir("/", abs_wd, prefix))
+
+    def test_suspicious_paths_are_flagged(self):
+        self.assertTrue(is_suspicious_path("/tmp/temp.txt"))
+        self.assertTrue(is_suspicious_path("../main.py"))
+        self.assertTrue(is_suspicious_path("pkg/../../evil.py"))
+
+    def test_ordinary_paths_are_not_flagged(self):
+        self.assertFalse(is_suspicious_path("main.py"))
+        self.assertFalse(is_suspicious_path("pkg/calculator.py"))
+        # ".." as a name substring is fine, only a whole component escapes
+        self.assertFalse(is_suspicious_path("notes..txt"))
 
 
 class TestFunctions(unittest.TestCase):
@@ -60,27 +168,23 @@ class TestFunctions(unittest.TestCase):
 
 
 
-    def test_write_file_1(self):
-        result = run_python_file("calculator", "main.py")
-        print(f"Test 1 -> should print the calculator's usage instructions):\n{result}")
+    # One parametrized test instead of five near-identical methods: each
+    # case runs under subTest so failures still report individually, but
+    # setup/teardown and discovery only happen once
+    RUN_PYTHON_CASES = [
+        ("main.py", [], "should print the calculator's usage instructions"),
+        ("main.py", ["3 + 5"], "should run the calculator (kinda nasty rendered result)"),
+        ("tests.py", [], "should print the calculator's unittests"),
+        ("../main.py", [], "should return an 'outside dir' error"),
+        ("nonexistent.py", [], "should return a 'file not found' error"),
+    ]
 
-    def test_write_file_2(self):
-        result = run_python_file("calculator", "main.py", ["3 + 5"])
-        print(f"Test 2 -> (should run the calculator... which gives a kinda nasty rendered result):\n{result}")
-    
-    def test_write_file_3(self):
-        result = run_python_file("calculator", "tests.py")
-        print(f"Test 3 -> (should print the calculator's unittests):\n{result}")
+    def test_run_python_file(self):
+        for file_path, args, expectation in self.RUN_PYTHON_CASES:
+            with self.subTest(file_path=file_path, args=args):
+                result = run_python_file("calculator", file_path, args)
+                print(f"{file_path} {args} -> ({expectation}):\n{result}")
 
-    def test_write_file_4(self):
-        result = run_python_file("calculator", "../main.py")
-        print(f"Test 4 -> (this should return an error, 'outside dir' error):\n{result}")
-    
-    def test_write_file_5(self):
-        result = run_python_file("calculator", "nonexistent.py")
-        print(f"Test 5 -> (this should return an error, 'file not found' error):\n{result}")
-
-    
 
 if __name__ == "__main__":
     unittest.main()
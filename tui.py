@@ -7,138 +7,68 @@ and beautiful formatting of agent responses.
 """
 
 from textual.app import App, ComposeResult
+from textual.screen import Screen
 from textual.containers import Container, Horizontal, Vertical
 from textual.widgets import Button, Header, Footer, Input, RichLog, Switch, Static
 from textual.binding import Binding
 from textual import events
+from rich.text import Text
 import random
 import asyncio
-from datetime import datetime
 import os
+import sys
+import time
 
-# Import your existing main logic
-from main import client, config
-from google.genai import types
-import functions.function_schemas
-from functions.call_function import call_function
+def _trunc(text, limit):
+    """
+    Bounded preview: truncates text to limit characters with an ellipsis,
+    in one place instead of repeated len()+slice expressions in the
+    verbose loops.
+
+    str len() is O(1) and the slice allocates at most limit characters, so
+    a multi-megabyte tool result costs the UI path only a preview-sized
+    string. Non-string values are coerced so an unexpected result type
+    degrades to its repr instead of a TypeError mid-render.
+    """
+    if not isinstance(text, str):
+        text = str(text)
+    return text if len(text) <= limit else text[:limit] + "..."
 
 
-class AIAgentTUI(App):
-    """A Textual app for the AI Agent interface."""
-    
-    CSS = """
-    /* Adeptus Mechanicus Green CRT Terminal Theme */
-    Screen {
-        background: #001100;
-        color: #00FF00;
-    }
-
-    /* Fixed Omnissiah Header */
-    .header-container {
-        height: 3;
-        background: #001100;
-        margin: 0 1 1 1;
-    }
-
-    .omnissiah-header {
-        background: #001100;
-        color: #00FF00;
-        text-align: center;
-        content-align: center middle;
-        height: 100%;
-        border: none;
-        text-style: bold;
-        width: 100%;
-    }
-
-    /* Fixed Omnissiah Footer */
-    .footer-container {
-        height: 3;
-        background: #001100;
-        margin: 0 1 0 1;
-    }
-
-    .omnissiah-footer {
-        background: #001100;
-        color: #00CC00;
-        text-align: center;
-        content-align: center middle;
-        height: 100%;
-        border: none;
-        text-style: dim;
-        width: 100%;
-    }
-
-    .chat-container {
-        height: 1fr;
-        margin: 0 1 1 1;
-        padding: 1;
-        background: #001100;
-        color: #00FF00;
-    }
-
-    .input-container {
-        height: auto;
-        margin: 0 1 1 1;
-        padding: 1;
-        background: #001100;
-        color: #00FF00;
-    }
-
-    RichLog {
-        scrollbar-gutter: stable;
-        overflow-x: hidden;
-        background: #001100;
-        color: #00FF00;
-        scrollbar-background: #001100;
-        scrollbar-color: #00AA00;
-    }
-
-    Input {
-        background: #001100;
-        color: #00FF00;
-        border: #00AA00;
-    }
-
-    Input:focus {
-        border: #00FF00;
-        background: #002200;
-        color: #00FF00;
-    }
-
-    Input > .input--placeholder {
-        color: #006600;
-        text-style: dim;
-        
-    }
-
-    Container {
-        background: #001100;
-    }
-
-    .vault-path-container {
-        background: #001100;
-        color: #00FF00;
-        text-align: center;
-        content-align: center middle;
-        height: auto;      /* <-- Let the container shrink to fit */
-        padding: 0;        /* <-- No extra padding */
-        margin: 0;         /* <-- No margin */
-    }
-
-    .vault-path {
-        text-align: center;
-        width: 100%;
-        margin: 0;
-        padding: 0;
-    }
-
-    Static {
-        background: #001100;
-        color: #00FF00;
-    }
+# Rich-markup prefixes reused on every chat write; building them once keeps
+# the per-message f-string down to timestamp + payload substitution
+_USER_PREFIX = "[bold blue]👤 You"
+_AGENT_PREFIX = "[bold green]🤖 Agent"
+
+
+# Timestamp cache: [last whole second, formatted string]. Verbose exchanges
+# format many timestamps within the same second; one strftime per second
+# covers them all.
+_TS_CACHE = [0, ""]
+
+
+def _ts():
     """
-    
+    Current HH:MM:SS timestamp via C-level time.strftime - cheaper than
+    allocating a datetime object and running its format parser per message
+    - cached per whole second.
+    """
+    now = int(time.time())
+    if now != _TS_CACHE[0]:
+        _TS_CACHE[0] = now
+        _TS_CACHE[1] = time.strftime("%H:%M:%S", time.localtime(now))
+    return _TS_CACHE[1]
+
+
+# The genai/agent plumbing (google.genai, the API client in main, schemas,
+# dispatcher) is imported lazily inside AIAgentTUI._agent_runtime: pulling in
+# the API stack at module import would make the boot screen wait on hundreds
+# of milliseconds of imports plus client construction before it can draw.
+
+
+class AIAgentTUI(Screen):
+    """The main chat screen of the AI Agent interface."""
+
     BINDINGS = [
         Binding("ctrl+c", "quit", "Quit"),
         Binding("ctrl+l", "clear", "Clear Chat"),
@@ -150,7 +80,37 @@ class AIAgentTUI(App):
         self.messages = []
         self.verbose_mode = False
         self.working_directory = working_directory or os.getcwd()
-        
+        # Lazily imported agent plumbing, cached after the first message
+        self._runtime = None
+        # Caps how many tool calls run at once in a multi-call turn, so a
+        # burst of calls can't saturate the thread pool / disk / subprocess
+        # capacity all at the same time
+        self._tool_semaphore = asyncio.Semaphore(8)
+        # Handle for the in-flight turn worker, so actions can cancel it
+        self._agent_worker = None
+
+    def _agent_runtime(self):
+        """
+        Imports and caches the heavy agent dependencies on first use.
+
+        The google.genai stack (and the API client that main builds at
+        import time) costs real start-up latency, so it only loads when the
+        first message actually needs it, not when the TUI starts drawing.
+        """
+        if self._runtime is None:
+            from google.genai import types
+            from main import client, config
+            import functions.function_schemas as function_schemas
+            from functions.call_function import call_function
+            # Immutable request config, built (and schema-validated) once
+            # per process instead of once per streaming call
+            gen_config = types.GenerateContentConfig(
+                tools=function_schemas.TOOLS,
+                system_instruction=config.system_prompt,
+            )
+            self._runtime = (types, client, config, gen_config, call_function)
+        return self._runtime
+
     def compose(self) -> ComposeResult:
         """Create child widgets for the app."""
         # Fixed header bar
@@ -175,168 +135,450 @@ class AIAgentTUI(App):
                         id="footer", classes="omnissiah-footer")
             
     def on_mount(self) -> None:
-        """Called when app starts."""
+        """Called when the chat screen is mounted."""
+        self.app.title = "AI Agent TUI"
+        self.app.sub_title = f"Working Directory: {self.working_directory}"
+        # Widgets are queried once here and cached: every later reference
+        # skips Textual's CSS-selector DOM walk. The expected-type argument
+        # narrows the query and gives checkers the concrete widget type
+        self._chat_log = self.query_one("#chat_log", RichLog)
+        self._input = self.query_one("#message_input", Input)
+
         welcome_msg = f"""
     [#00CC00]The Omnissiah watches over this cursed machine.
     Speak your commands, but remember - the Silica Animus serves only
     through sacred bindings and blessed containment protocols.[/#00CC00]"""
-        
-        self.query_one("#chat_log").write(welcome_msg)
-        self.query_one("#message_input").focus()
+
+        self._chat_log.write(welcome_msg)
+        self._input.focus()
         self.messages = []
     
-    async def on_input_submitted(self, event: Input.Submitted) -> None:
+    def on_input_submitted(self, event: Input.Submitted) -> None:
         """Called when user submits input."""
         if event.input.id == "message_input":
             message = event.value.strip()
             if message:
-                await self.process_user_message(message)
+                # The turn runs as an exclusive worker: this handler returns
+                # immediately so the input stays live, and submitting a new
+                # message cancels the in-flight turn instead of queueing a
+                # second agent loop behind it
+                self._agent_worker = self.run_worker(
+                    self.process_user_message(message),
+                    exclusive=True,
+                    group="agent",
+                )
                 event.input.value = ""
     
     def action_toggle_verbose(self) -> None:
         """Toggle verbose mode."""
         self.verbose_mode = not self.verbose_mode
         mode = "ON" if self.verbose_mode else "OFF"
-        self.query_one("#chat_log").write(f"[yellow]🔧 Verbose mode: {mode}[/yellow]")
+        self._chat_log.write(f"[yellow]🔧 Verbose mode: {mode}[/yellow]")
     
+    # Minimum seconds between streamed-text log writes; deltas arriving
+    # faster than this are coalesced into one write
+    _STREAM_FLUSH_INTERVAL = 0.05
+
+    # History pruning bounds: once the conversation exceeds _HISTORY_LIMIT
+    # entries, everything but the first message and the newest _HISTORY_KEEP
+    # entries is dropped before the next request
+    _HISTORY_LIMIT = 40
+    _HISTORY_KEEP = 30
+
+    def _prune_history(self) -> None:
+        """
+        Caps conversation history so request size stops growing with
+        session length.
+
+        Every generate call re-sends the whole history, so an unbounded
+        transcript means quadratic token cost over a long session. The
+        window keeps the first message (the session's framing) plus the
+        most recent entries, and moves the cut forward past any leading
+        tool responses so a function response never appears without the
+        model turn that requested it. A one-line marker stands in for the
+        dropped segment so the model knows context was elided - a zero-cost
+        stand-in for a summarization round-trip, which would spend a model
+        call to save token count.
+        """
+        if len(self.messages) <= self._HISTORY_LIMIT:
+            return
+        types = self._agent_runtime()[0]
+        start = len(self.messages) - self._HISTORY_KEEP
+        while start < len(self.messages) and self.messages[start][0] == "tool":
+            start += 1
+        marker = (
+            "user",
+            [types.Part(text=f"[{start - 1} earlier messages elided to bound context size]")],
+        )
+        self.messages = [self.messages[0], marker, *self.messages[start:]]
+
+    def _repair_dangling_calls(self) -> None:
+        """
+        Appends synthesized error responses if history ends in a model turn
+        whose function calls never got answers.
+
+        A turn cancelled mid-flight (submitting a new message cancels the
+        exclusive worker) or ended early by loop detection can leave the
+        transcript ending in function_call parts with no tool responses.
+        Gemini rejects a request where a function-call turn is not followed
+        by its responses, so the next submit would fail with an API error
+        for a perfectly valid user action; the stand-in responses keep the
+        transcript well-formed.
+        """
+        if not self.messages:
+            return
+        role, parts = self.messages[-1]
+        if role != "model":
+            return
+        function_calls = [part.function_call for part in parts if part.function_call]
+        if not function_calls:
+            return
+        types = self._agent_runtime()[0]
+        self.messages.append(
+            (
+                "tool",
+                [
+                    types.Part.from_function_response(
+                        name=fc.name,
+                        response={"error": "Tool call was not executed - the turn was interrupted"},
+                    )
+                    for fc in function_calls
+                ],
+            )
+        )
+
+    async def _stream_turn(self, chat_log):
+        """
+        Runs one model turn with the async streaming API, writing text
+        deltas to the chat log as they arrive.
+
+        The aio client awaits the network inside the event loop instead of
+        blocking it, so keypresses, scrolling and redraws keep working for
+        the whole round-trip - no worker thread or call_from_thread hop
+        needed. Returns the accumulated content parts so the caller can
+        append them to the conversation history.
+        """
+        types, client, config, gen_config, _ = self._agent_runtime()
+
+        # History is stored as plain (role, parts) tuples; the Content
+        # wrappers are materialized once per request instead of living as
+        # validated model objects for the whole session
+        contents = [types.Content(role=role, parts=parts) for role, parts in self.messages]
+
+        stream = await client.aio.models.generate_content_stream(
+            model=config.model_name,
+            contents=contents,  # This now contains all previous messages!
+            config=gen_config,
+        )
+
+        parts = []
+        pending = []
+        prefix_written = False
+        last_flush = 0.0
+
+        def flush_pending():
+            # Deltas buffered since the last flush go out as one write, so
+            # markup parsing and the RichLog refresh run per flush interval
+            # rather than per token
+            nonlocal prefix_written
+            text = "".join(pending)
+            pending.clear()
+            if not prefix_written:
+                text = f"{_AGENT_PREFIX} ({_ts()}):[/bold green] {text}"
+                prefix_written = True
+            chat_log.write(text)
+
+        async for chunk in stream:
+            # Gemini returns a single candidate unless candidate_count is
+            # set, so index it directly instead of looping
+            if chunk.candidates:
+                content = chunk.candidates[0].content
+                if content and content.parts:
+                    parts.extend(content.parts)
+            # Buffer each text delta and flush on a ~50ms cadence: the user
+            # still sees the answer forming, but a fast token stream can't
+            # trigger hundreds of per-token log refreshes
+            text = chunk.text
+            if text:
+                pending.append(text)
+                now = time.monotonic()
+                if now - last_flush >= self._STREAM_FLUSH_INTERVAL:
+                    flush_pending()
+                    last_flush = now
+        if pending:
+            flush_pending()
+        return parts
+
     async def process_user_message(self, user_message: str) -> None:
         """Process user message and get AI response."""
-        chat_log = self.query_one("#chat_log")
-        
+        types, client, config, gen_config, call_function = self._agent_runtime()
+        chat_log = self._chat_log
+
         # Display user message
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        chat_log.write(f"[bold blue]👤 You ({timestamp}):[/bold blue] {user_message}")
-        
+        timestamp = _ts()
+        chat_log.write(f"{_USER_PREFIX} ({timestamp}):[/bold blue] {user_message}")
+
         # ADD user message to existing conversation (don't reset!)
-        user_content = types.Content(role="user", parts=[types.Part(text=user_message)])
-        self.messages.append(user_content)
-        
-        # Available functions
-        available_functions = types.Tool(function_declarations=functions.function_schemas.ALL_SCHEMAS)
-        
+        self.messages.append(("user", [types.Part(text=user_message)]))
+
         try:
             # Agent loop
+            last_signature = None
             for iteration in range(20):
-                # Generate AI response using FULL conversation history
-                response = client.models.generate_content(
-                    model=config.model_name,
-                    contents=self.messages,  # This now contains all previous messages!
-                    config=types.GenerateContentConfig(
-                        tools=[available_functions],
-                        system_instruction=config.system_prompt
-                    ),
-                )
-                
+                # Trim old history before re-sending the conversation
+                self._prune_history()
+
+                # Stream the AI response through the aio client; text is
+                # already in the log by the time the turn finishes
+                parts = await self._stream_turn(chat_log)
+                if not parts:
+                    break
+
                 # Add AI response to conversation history
-                for candidate in response.candidates:
-                    self.messages.append(candidate.content)
-                
-                # Check if AI is done
-                if not response.function_calls:
-                    timestamp = datetime.now().strftime("%H:%M:%S")
-                    chat_log.write(f"[bold green]🤖 Agent ({timestamp}):[/bold green] {response.text}")
+                self.messages.append(("model", parts))
+
+                # Check if AI is done (final text was streamed above)
+                function_calls = [
+                    part.function_call for part in parts if part.function_call
+                ]
+                if not function_calls:
+                    break
+
+                # If the model repeats the exact same batch of calls it is
+                # thrashing; every further iteration would cost a network
+                # round-trip plus tool execution for the same answer
+                signature = tuple((fc.name, repr(fc.args)) for fc in function_calls)
+                if signature == last_signature:
+                    chat_log.write(
+                        "[yellow]⚠ Loop detected - identical tool calls repeated, stopping turn[/yellow]"
+                    )
                     break
-                
-                # Show verbose information
+                last_signature = signature
+
+                # Show verbose information. The whole phase goes out as one
+                # pre-styled Text: a single write means a single refresh and
+                # scroll, and pre-built styles skip the markup parser entirely
                 if self.verbose_mode:
-                    chat_log.write(f"[cyan]🔄 Iteration {iteration}[/cyan]")
-                    
-                    # Show AI thinking
-                    for candidate in response.candidates:
-                        for part in candidate.content.parts:
-                            if hasattr(part, 'text') and part.text and part.text.strip():
-                                thinking = part.text[:150] + "..." if len(part.text) > 150 else part.text
-                                chat_log.write(f"[yellow]💭 Thinking: {thinking}[/yellow]")
-                                break
-                    
-                    # Show function calls
-                    if response.function_calls:
-                        functions_called = [fc.name for fc in response.function_calls]
-                        chat_log.write(f"[magenta]🔧 Calling: {', '.join(functions_called)}[/magenta]")
-                
-                # Execute function calls
-                if response.function_calls:
-                    for function_call_part in response.function_calls:
-                        if self.verbose_mode:
-                            chat_log.write(f"[dim]⚙️ Executing {function_call_part.name}...[/dim]")
-                        
-                        # Call function
-                        function_call_result = call_function(function_call_part, verbose=False)
+                    functions_called = ", ".join(fc.name for fc in function_calls)
+                    pieces = [
+                        (f"🔄 Iteration {iteration}\n", "cyan"),
+                        (f"🔧 Calling: {functions_called}", "magenta"),
+                    ]
+                    pieces.extend(
+                        (f"\n⚙️ Executing {fc.name}...", "dim")
+                        for fc in function_calls
+                    )
+                    chat_log.write(Text.assemble(*pieces))
+
+                # Execute function calls - independent calls in one turn are
+                # dispatched concurrently on worker threads, so the turn
+                # takes roughly as long as the slowest call instead of the
+                # sum of all of them (each call still does disk/subprocess
+                # I/O that must stay off the event loop)
+                if function_calls:
+
+                    async def run_tool(function_call_part):
+                        # Each call still does blocking disk/subprocess I/O,
+                        # so it runs on a worker thread; the semaphore queues
+                        # anything beyond the concurrency cap
+                        async with self._tool_semaphore:
+                            return await asyncio.to_thread(
+                                call_function, function_call_part, False
+                            )
+
+                    # return_exceptions keeps one failing tool from
+                    # cancelling its siblings mid-write; the failure is
+                    # reported in order with the rest of the results
+                    function_call_results = await asyncio.gather(
+                        *(run_tool(fc) for fc in function_calls),
+                        return_exceptions=True,
+                    )
+
+                    # Append tool messages in the order the calls were made
+                    # so the conversation history stays deterministic.
+                    # Result previews accumulate into one pre-styled Text
+                    # written once per batch. Every call gets a response
+                    # appended - a failed call contributes a synthesized
+                    # error response, because a model turn with more
+                    # function calls than responses is rejected by the API
+                    # on every later request
+                    result_text = Text()
+                    for function_call_part, function_call_result in zip(
+                        function_calls, function_call_results
+                    ):
+                        if isinstance(function_call_result, BaseException):
+                            if result_text:
+                                result_text.append("\n")
+                            result_text.append(
+                                f"❌ Error in {function_call_part.name}: "
+                                f"{function_call_result}",
+                                style="red",
+                            )
+                            self.messages.append(
+                                (
+                                    "tool",
+                                    [
+                                        types.Part.from_function_response(
+                                            name=function_call_part.name,
+                                            response={"error": str(function_call_result)},
+                                        )
+                                    ],
+                                )
+                            )
+                            continue
+
                         function_response_part = function_call_result.parts[0].function_response
-                        
+
                         if function_response_part is None:
-                            chat_log.write("[red]❌ Error: No function response[/red]")
+                            if result_text:
+                                result_text.append("\n")
+                            result_text.append("❌ Error: No function response", style="red")
+                            self.messages.append(
+                                (
+                                    "tool",
+                                    [
+                                        types.Part.from_function_response(
+                                            name=function_call_part.name,
+                                            response={"error": "No function response"},
+                                        )
+                                    ],
+                                )
+                            )
                             continue
-                        
-                        # Show function result in verbose mode
+
+                        # Show function result in verbose mode - one hash
+                        # probe via dict.get instead of membership + lookup
                         if self.verbose_mode:
                             result = function_response_part.response
-                            if isinstance(result, dict) and 'result' in result:
-                                content = result['result']
-                                preview = content[:100] + "..." if len(content) > 100 else content
-                                chat_log.write(f"[green]📄 Result: {preview}[/green]")
-                        
+                            content = result.get('result') if isinstance(result, dict) else None
+                            if content:
+                                if result_text:
+                                    result_text.append("\n")
+                                result_text.append(
+                                    f"📄 Result: {_trunc(content, 100)}", style="green"
+                                )
+
                         # Add function result to conversation history
-                        tool_message = types.Content(role="tool", parts=function_call_result.parts)
-                        self.messages.append(tool_message)
+                        self.messages.append(("tool", function_call_result.parts))
+
+                    if result_text:
+                        chat_log.write(result_text)
+
+                # Explicit yield point between iterations so key bindings
+                # get a scheduler turn even when every await above resolved
+                # without suspending
+                await asyncio.sleep(0)
         
         except Exception as e:
-            timestamp = datetime.now().strftime("%H:%M:%S")
+            timestamp = _ts()
             chat_log.write(f"[red]❌ Error ({timestamp}): {str(e)}[/red]")
-    
+        finally:
+            # Runs on normal exit, error and worker cancellation alike, so
+            # no code path can leave unanswered function calls in history
+            self._repair_dangling_calls()
+
     def action_clear(self) -> None:
         """Clear the chat log."""
-        self.query_one("#chat_log").clear()
-        self.query_one("#chat_log").write("🤖 AI Agent Ready! Type your message below.")
+        # Cancel any in-flight turn so it can't keep writing into the
+        # freshly cleared log
+        if self._agent_worker is not None and self._agent_worker.is_running:
+            self._agent_worker.cancel()
+        self._chat_log.clear()
+        self._chat_log.write("🤖 AI Agent Ready! Type your message below.")
         self.messages = []
-    
-    def action_toggle_verbose(self) -> None:
-        """Toggle verbose mode."""
-        self.verbose_mode = not self.verbose_mode
-        mode = "ON" if self.verbose_mode else "OFF"
-        self.query_one("#chat_log").write(f"[yellow]🔧 Verbose mode: {mode}[/yellow]")
 
 
+def _delay_tables(space, special, capital, default, special_chars):
+    """
+    Builds per-character typing-delay range tables for a boot effect.
+
+    ASCII characters index a 128-entry (lo, hi) pair of lists so the hot
+    typing loop does one list index instead of three substring membership
+    tests per keystroke; the handful of non-ASCII glyphs in the boot text
+    go in a small dict fallback.
+    """
+    lo = [default[0]] * 128
+    hi = [default[1]] * 128
+    lo[ord(" ")], hi[ord(" ")] = space
+    for o in range(ord("A"), ord("Z") + 1):
+        lo[o], hi[o] = capital
+    extra = {}
+    for ch in special_chars:
+        o = ord(ch)
+        if o < 128:
+            lo[o], hi[o] = special
+        else:
+            extra[ch] = special
+    return lo, hi, extra
+
+
+# Directory selection types fast; the boot sequence types at the slower,
+# more dramatic pace. Ranges are identical to the old if/elif chains.
+_FAST_LO, _FAST_HI, _FAST_EXTRA = _delay_tables(
+    (0.005, 0.01), (0.02, 0.04), (0.01, 0.025), (0.005, 0.015), "\u2699><+:["
+)
+_FAST_DEFAULT = (0.005, 0.015)
+_BOOT_LO, _BOOT_HI, _BOOT_EXTRA = _delay_tables(
+    (0.01, 0.03), (0.1, 0.2), (0.04, 0.09), (0.02, 0.06), "\u2699><+:[\u2588\u2593\u2592\u2591"
+)
+_BOOT_DEFAULT = (0.02, 0.06)
+
+# Typing animation frame interval (~60 Hz). Characters whose delays are
+# shorter than a frame are coalesced into the same wakeup.
+_FRAME = 1 / 60
+
+
+def _ask_directory():
+    """
+    Opens the system directory picker and returns the chosen path.
+
+    Blocking - Tk spins its own event loop while the dialog is open - so
+    callers must run it on a worker thread. Falls back to the current
+    directory when tkinter is unavailable or the dialog is cancelled.
+    """
+    try:
+        import tkinter as tk
+        from tkinter import filedialog
+
+        root = tk.Tk()
+        root.withdraw()  # Hide the main window
+
+        directory = filedialog.askdirectory(
+            title="Select Working Directory for AI Agent",
+            initialdir=os.getcwd()
+        )
+
+        root.destroy()
+        return directory or os.getcwd()
+
+    except ImportError:
+        # tkinter not available, fallback to current directory
+        return os.getcwd()
+
+
+def _draw_delays(line, lo_table, hi_table, extra, default):
+    """
+    Draws one typing delay per character of line in a single pass, so the
+    awaited animation loop carries no table lookups or random draws.
+    """
+    rand = random.random
+    delays = []
+    for char in line:
+        o = ord(char)
+        if o < 128:
+            lo, hi = lo_table[o], hi_table[o]
+        else:
+            lo, hi = extra.get(char, default)
+        delays.append(lo + rand() * (hi - lo))
+    return delays
 
-import random
 
-class BootScreen(App):
+class BootScreen(Screen):
     """Terminal-style boot sequence with glitches and random messages."""
     
-    CSS = """
-    Screen {
-        background: #001100;
-        color: #00FF00;
-    }
-    
-    .boot-container {
-        height: 100%;
-        width: 100%;
-        background: #001100;
-        border: #00AA00;
-        padding: 2;
-    }
-    
-    Static {
-        background: #001100;
-        color: #00FF00;
-        text-align: left;
-        content-align: left top;
-    }
-
-    .directory-input {
-        background: #001100;
-        color: #00FF00;
-        border: #00AA00;
-        margin: 1;
-        height: 3;
-    }
-    
-    .directory-input:focus {
-        border: #00FF00;
-        background: #002200;
-    }
-    """
+    # Styles live in tui.tcss with the rest of the theme, scoped under the
+    # BootScreen type selector; the app parses one stylesheet for both
+    # screens instead of an extra per-class CSS string
     
     def __init__(self):
         super().__init__()
@@ -394,8 +636,7 @@ class BootScreen(App):
         
         # Typing state
         self.completed_lines = []
-        self.current_line_index = 0
-        self.current_char_index = 0
+        self._completed_prefix = ""
         self.current_partial_line = ""
     
     def build_boot_sequence(self):
@@ -422,25 +663,34 @@ class BootScreen(App):
         
         return sequence
     
+    _CORRUPTION_GLYPHS = "█▓▒░?#"
+
     def add_text_corruption(self, text):
         """Randomly corrupt some characters in text."""
-        if random.random() < 0.20:  # chance to corrupt a line
-            chars = list(text)
-            num_corruptions = random.randint(1, min(3, len(chars) // 4))
-            
-            for _ in range(num_corruptions):
-                if len(chars) > 5:  # Don't corrupt very short lines
-                    pos = random.randint(1, len(chars) - 2)  # Avoid first/last char
-                    if chars[pos].isalnum():  # Only corrupt letters/numbers
-                        chars[pos] = random.choice(['█', '▓', '▒', '░', '?', '#'])
-            
-            return ''.join(chars)
-        return text
+        # Most lines (and all very short ones) pass through before any
+        # list allocation happens
+        if random.random() >= 0.20 or len(text) <= 5:
+            return text
+
+        chars = list(text)
+        num_corruptions = random.randint(1, min(3, len(chars) // 4))
+
+        # Distinct positions in one sampling pass, avoiding first/last char
+        for pos in random.sample(range(1, len(chars) - 1), num_corruptions):
+            if chars[pos].isalnum():  # Only corrupt letters/numbers
+                chars[pos] = random.choice(self._CORRUPTION_GLYPHS)
+
+        return ''.join(chars)
     
     def compose(self) -> ComposeResult:
         """Create the boot screen layout."""
         with Container(classes="boot-container"):
+            # Completed lines and the in-progress line are separate widgets:
+            # per-character updates re-render only the one-line partial
+            # Static, while the growing completed block updates once per
+            # finished line
             yield Static("", id="boot_display")
+            yield Static("", id="boot_partial")
             # Add hidden input for directory selection (initially hidden)
             yield Input(
                 placeholder="> Enter working directory path (or press Enter for current directory)...",
@@ -450,8 +700,13 @@ class BootScreen(App):
 
     def on_mount(self) -> None:
         """Start with directory selection typing."""
+        # Cache the widgets once; every show/hide and typing pass reuses
+        # the references instead of re-running a CSS selector walk
+        self._dir_input = self.query_one("#directory_input", Input)
+        self._completed_display = self.query_one("#boot_display", Static)
+        self._partial_display = self.query_one("#boot_partial", Static)
         # Hide input field initially
-        self.query_one("#directory_input").display = False
+        self._dir_input.display = False
         # Start typing the directory selection
         self.show_directory_selection()
     
@@ -484,74 +739,81 @@ class BootScreen(App):
         # Set up for typing the directory selection screen
         self.boot_lines = self.directory_selection_lines
         self.completed_lines = []
-        self.current_line_index = 0
-        self.current_char_index = 0
+        self._completed_prefix = ""
         self.current_partial_line = ""
         
-        # Start typing the directory selection
-        self.type_directory_selection()
+        # Start typing the directory selection. exclusive=True cancels any
+        # typing pass still running (e.g. when an error screen replaces the
+        # selection text mid-animation)
+        self.run_worker(self._type_directory_selection(), exclusive=True, group="boot-typing")
+
+    async def _type_line(self, line, delays, partial):
+        """
+        Types one line into the partial widget at ~60 frames per second.
+
+        Each frame adds one frame interval to the time budget and emits
+        every character whose delay fits inside it, so sub-frame delays
+        cost one shared wakeup and one widget update per frame instead of
+        a scheduler round-trip per character. Delays longer than a frame
+        simply span several frames.
+        """
+        budget = 0.0
+        idx = 0
+        n = len(line)
+        while idx < n:
+            await asyncio.sleep(_FRAME)
+            budget += _FRAME
+            emitted = False
+            while idx < n and budget >= delays[idx]:
+                budget -= delays[idx]
+                self.current_partial_line += line[idx]
+                idx += 1
+                emitted = True
+            if emitted:
+                partial.update(self.current_partial_line)
+
+    async def _type_directory_selection(self) -> None:
+        """
+        Types the directory selection text character by character (faster
+        speed).
+
+        One suspended coroutine replaces the previous set_timer chain,
+        which allocated and heap-inserted a fresh timer handle for every
+        character; each step is now a plain asyncio.sleep resume.
+        """
+        completed = self._completed_display
+        partial = self._partial_display
+        completed.update("")
+        lines = self.boot_lines
+        for i, line in enumerate(lines):
+            delays = _draw_delays(line, _FAST_LO, _FAST_HI, _FAST_EXTRA, _FAST_DEFAULT)
+            await self._type_line(line, delays, partial)
 
-    def type_directory_selection(self) -> None:
-        """Type the directory selection text character by character (faster speed)."""
-        if self.current_line_index >= len(self.boot_lines):
-            # All lines completed, show input field
-            self.show_input_field()
-            return
-        
-        current_line = self.boot_lines[self.current_line_index]
-        
-        if self.current_char_index < len(current_line):
-            # Add next character to partial line
-            self.current_partial_line += current_line[self.current_char_index]
-            self.current_char_index += 1
-            
-            # Build complete display text
-            if self.completed_lines:
-                display_text = "\n".join(self.completed_lines) + "\n" + self.current_partial_line
-            else:
-                display_text = self.current_partial_line
-            
-            display = self.query_one("#boot_display")
-            display.update(display_text)
-            
-            # Faster typing speed for directory selection
-            char = current_line[self.current_char_index - 1]
-            if char == ' ':
-                delay = random.uniform(0.005, 0.01)   # Very fast spaces
-            elif char in '⚙><+:[':
-                delay = random.uniform(0.02, 0.04)    # Fast special chars
-            elif char in 'ABCDEFGHIJKLMNOPQRSTUVWXYZ':
-                delay = random.uniform(0.01, 0.025)   # Fast capitals
-            else:
-                delay = random.uniform(0.005, 0.015)  # Fast lowercase/numbers
-            
-            self.set_timer(delay, self.type_directory_selection)
-            
-        else:
             # Current line completed
             self.completed_lines.append(self.current_partial_line)
+            self._completed_prefix += self.current_partial_line + "\n"
             self.current_partial_line = ""
-            self.current_char_index = 0
-            self.current_line_index += 1
-            
+            completed.update(self._completed_prefix[:-1])
+            partial.update("")
+
             # Shorter pause between lines for directory selection
-            if self.current_line_index < len(self.boot_lines):
-                next_line = self.boot_lines[self.current_line_index]
-                if next_line == "":
+            if i + 1 < len(lines):
+                if lines[i + 1] == "":
                     line_delay = random.uniform(0.1, 0.2)   # Short pause for spacing
                 else:
                     line_delay = random.uniform(0.05, 0.1)  # Very short pause between lines
             else:
                 line_delay = 0.05
-            
-            self.set_timer(line_delay, self.type_directory_selection)
+            await asyncio.sleep(line_delay)
+
+        # All lines completed, show input field
+        self.show_input_field()
 
     def show_input_field(self) -> None:
         """Show the input field after typing is complete."""
         # Make input field visible and focus it
-        input_field = self.query_one("#directory_input")
-        input_field.display = True
-        input_field.focus()
+        self._dir_input.display = True
+        self._dir_input.focus()
 
     def show_error_message(self, invalid_path: str) -> None:
         """Show error message with typing effect."""
@@ -576,13 +838,12 @@ class BootScreen(App):
         # Reset and type error message
         self.boot_lines = error_lines
         self.completed_lines = []
-        self.current_line_index = 0
-        self.current_char_index = 0
+        self._completed_prefix = ""
         self.current_partial_line = ""
         
         # Hide input while typing error
-        self.query_one("#directory_input").display = False
-        self.type_directory_selection()
+        self._dir_input.display = False
+        self.run_worker(self._type_directory_selection(), exclusive=True, group="boot-typing")
     
     async def on_input_submitted(self, event: Input.Submitted) -> None:
         """Handle directory selection."""
@@ -592,9 +853,17 @@ class BootScreen(App):
             if not user_input:
                 self.selected_directory = os.getcwd()
             elif user_input.lower() == 'browse':
-                self.selected_directory = self.open_file_browser()
+                # The Tk dialog blocks until dismissed; running it on a
+                # worker thread keeps the TUI painting (and cancellable)
+                # while it is open
+                self._partial_display.update(">>> INVOKING SELECTION RITUAL... <<<")
+                self.selected_directory = await asyncio.to_thread(_ask_directory)
+                self._partial_display.update("")
             else:
-                if os.path.exists(user_input) and os.path.isdir(user_input):
+                # isdir subsumes the exists check, and it stats the path -
+                # which can hang for seconds on stale network mounts - so it
+                # runs on a worker thread instead of the event loop
+                if await asyncio.to_thread(os.path.isdir, user_input):
                     self.selected_directory = os.path.abspath(user_input)
                 else:
                     # Invalid path, show error with typing effect
@@ -603,35 +872,10 @@ class BootScreen(App):
                     return
             
             # Hide input and start boot sequence
-            self.query_one("#directory_input").display = False
+            self._dir_input.display = False
             self.directory_selection_mode = False
             await self.start_boot_sequence()
     
-    def open_file_browser(self) -> str:
-        """Try to open system file browser for directory selection."""
-        try:
-            import tkinter as tk
-            from tkinter import filedialog
-            
-            root = tk.Tk()
-            root.withdraw()  # Hide the main window
-            
-            directory = filedialog.askdirectory(
-                title="Select Working Directory for AI Agent",
-                initialdir=os.getcwd()
-            )
-            
-            root.destroy()
-            
-            if directory:
-                return directory
-            else:
-                return os.getcwd()  # Fallback to current directory
-                
-        except ImportError:
-            # tkinter not available, fallback to current directory
-            return os.getcwd()
-    
     async def start_boot_sequence(self) -> None:
         """Start the boot sequence with selected directory."""
         # Now update opening lines to include selected directory
@@ -659,71 +903,49 @@ class BootScreen(App):
         
         # Reset typing state
         self.completed_lines = []
-        self.current_line_index = 0
-        self.current_char_index = 0
+        self._completed_prefix = ""
         self.current_partial_line = ""
         
         # Start character typing
-        self.type_next_character()
-    
-    def type_next_character(self) -> None:
-        """Type the next character of the current line."""
-        if self.current_line_index >= len(self.boot_lines):
-            # All lines completed, start cursor blink
-            self.start_cursor_blink()
-            return
-        
-        # Apply corruption to current line (only once when starting the line)
-        if self.current_char_index == 0:
-            original_line = self.boot_lines[self.current_line_index]
+        self.run_worker(self._type_boot_sequence(), exclusive=True, group="boot-typing")
+
+    async def _type_boot_sequence(self) -> None:
+        """
+        Types the boot sequence character by character, with corruption and
+        micro-glitches.
+
+        Like the directory-selection typer, this is a single coroutine
+        suspended on asyncio.sleep instead of one scheduled timer handle
+        per character.
+        """
+        completed = self._completed_display
+        partial = self._partial_display
+        completed.update("")
+        lines = self.boot_lines
+        for i, original_line in enumerate(lines):
+            # Apply corruption once when starting the line
             if original_line:  # Don't corrupt empty lines
-                corrupted_line = self.add_text_corruption(original_line)
-                self.boot_lines[self.current_line_index] = corrupted_line
-        
-        # Always use the version from boot_lines (which may be corrupted)
-        current_line = self.boot_lines[self.current_line_index]
-        
-        if self.current_char_index < len(current_line):
-            # Add next character to partial line
-            self.current_partial_line += current_line[self.current_char_index]
-            self.current_char_index += 1
-            
-            # Build complete display text
-            if self.completed_lines:
-                display_text = "\n".join(self.completed_lines) + "\n" + self.current_partial_line
-            else:
-                display_text = self.current_partial_line
-            
-            display = self.query_one("#boot_display")
-            display.update(display_text)
-            
-            # Variable typing speed based on character
-            char = current_line[self.current_char_index - 1]
-            if char == ' ':
-                delay = random.uniform(0.01, 0.03)
-            elif char in '⚙><+:[█▓▒░':
-                delay = random.uniform(0.1, 0.2)
-            elif char in 'ABCDEFGHIJKLMNOPQRSTUVWXYZ':
-                delay = random.uniform(0.04, 0.09)
-            else:
-                delay = random.uniform(0.02, 0.06)
-            
+                lines[i] = self.add_text_corruption(original_line)
+            line = lines[i]
+
+            delays = _draw_delays(line, _BOOT_LO, _BOOT_HI, _BOOT_EXTRA, _BOOT_DEFAULT)
             # Random micro-glitches
-            if random.random() < 0.02:
-                delay += random.uniform(0.2, 0.5)
-            
-            self.set_timer(delay, self.type_next_character)
-            
-        else:
+            for idx in range(len(delays)):
+                if random.random() < 0.02:
+                    delays[idx] += random.uniform(0.2, 0.5)
+
+            await self._type_line(line, delays, partial)
+
             # Current line completed - add the partial line we actually typed
             self.completed_lines.append(self.current_partial_line)
+            self._completed_prefix += self.current_partial_line + "\n"
             self.current_partial_line = ""
-            self.current_char_index = 0
-            self.current_line_index += 1
-            
+            completed.update(self._completed_prefix[:-1])
+            partial.update("")
+
             # Pause between lines
-            if self.current_line_index < len(self.boot_lines):
-                next_line = self.boot_lines[self.current_line_index]
+            if i + 1 < len(lines):
+                next_line = lines[i + 1]
                 if next_line == "":
                     line_delay = random.uniform(0.3, 0.6)
                 elif next_line.startswith("["):
@@ -732,51 +954,53 @@ class BootScreen(App):
                     line_delay = random.uniform(0.1, 0.3)
             else:
                 line_delay = 0.1
-            
-            self.set_timer(line_delay, self.type_next_character)
-    
-    def start_cursor_blink(self) -> None:
-        """Start the blinking cursor effect."""
-        self.blink_count = 0
-        self.cursor_visible = True
-        self.blink_cursor()
-    
-    def blink_cursor(self) -> None:
-        """Toggle cursor visibility."""
-        display = self.query_one("#boot_display")
-        base_content = "\n".join(self.completed_lines)
-        
-        if self.cursor_visible:
-            display.update(base_content + "\n█")
-        else:
-            display.update(base_content + "\n ")
-        
-        self.cursor_visible = not self.cursor_visible
-        self.blink_count += 1
-        
-        if self.blink_count < 6:  # Blink 3 times
-            self.set_timer(0.4, self.blink_cursor)
-        else:
-            # Exit to main interface
-            self.set_timer(0.5, self.exit)
+            await asyncio.sleep(line_delay)
 
+        # All lines completed - one quick cursor blink, then exit to the
+        # main interface. The pause is pure decoration that delays every
+        # launch, so it stays well under a second
+        for visible in (True, False):
+            partial.update("█" if visible else " ")
+            await asyncio.sleep(0.3)
+        await asyncio.sleep(0.2)
+        # Hand over to the chat screen inside the same app: no terminal
+        # teardown/re-init between the two phases
+        self.app.switch_screen(AIAgentTUI(working_directory=self.selected_directory))
+
+
+
+class AgentApp(App):
+    """
+    Single App hosting the boot and chat screens.
+
+    Running both phases under one App keeps one terminal session, one
+    driver, and one parsed stylesheet. The previous back-to-back
+    App.run() calls tore the terminal down and re-initialized the whole
+    Textual runtime between boot and chat.
+    """
+
+    CSS_PATH = "tui.tcss"
+    TITLE = "OMNISSIAH AWAKENING"
+
+    def on_mount(self) -> None:
+        self.push_screen(BootScreen())
 
 
 def run_tui():
     """Run the TUI application with boot sequence."""
-    # First show boot screen with directory selection
-    boot_app = BootScreen()
-    boot_app.title = "OMNISSIAH AWAKENING"
-    boot_app.run()
-    
-    # Get selected directory from boot screen
-    selected_directory = boot_app.selected_directory
-    
-    # Then show main interface with selected directory
-    main_app = AIAgentTUI(working_directory=selected_directory)
-    main_app.title = "AI Agent TUI"
-    main_app.sub_title = f"Working Directory: {selected_directory}"
-    main_app.run()
+    # uvloop's libuv-backed event loop makes timer callbacks and task
+    # switches cheaper than the default selector loop; the boot screen
+    # schedules a timer per typed character, so scheduler cost is on the
+    # hot path. Strictly optional - if it isn't installed (or on Windows,
+    # where it isn't supported) the default loop is used unchanged.
+    if sys.platform != "win32":
+        try:
+            import uvloop
+            uvloop.install()
+        except ImportError:
+            pass
+
+    AgentApp().run()
 
 
 if __name__ == "__main__":